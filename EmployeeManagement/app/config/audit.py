@@ -0,0 +1,156 @@
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+
+_FLUSH = object()
+_STOP = object()
+
+
+class AuditLogWriter:
+    """
+    Buffers audit entries in memory and writes them from a background thread.
+
+    A batch is written when batch_size entries are waiting, when the oldest
+    waiting entry is flush_interval seconds old, on flush(), and on close().
+    The queue is bounded (max_queue): when the database falls behind, log()
+    blocks the caller instead of growing memory without limit. A batch that
+    fails with a transient error (connection lost, lock timeout) is retried on
+    the next flush. One that fails because of its data (is_permanent(error),
+    e.g. an unknown user_id) is retried entry by entry so only the bad entries
+    are set aside. Those, and whatever is still unwritten when the writer
+    closes, are appended to fallback_path as JSON lines.
+    """
+
+    def __init__(self, write_batch, batch_size=200, flush_interval=1.0, max_queue=10000,
+                 fallback_path="audit_fallback.jsonl", is_permanent=lambda error: False):
+        self._write_batch = write_batch  # callable([(user_id, action, timestamp), ...]); raises on failure
+        self._is_permanent = is_permanent
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fallback_path = fallback_path
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def log(self, user_id, action):
+        if self._closed:
+            raise RuntimeError("Audit log writer is closed")
+        self._ensure_started()
+        # Timestamp is taken when the action happens, not when the batch lands
+        self._queue.put((user_id, action, datetime.now()))
+
+    def flush(self, timeout=None):
+        """Block until everything logged so far has been handed to the database."""
+        if self._thread is None:
+            return True
+        if self._closed:
+            # Nothing reads the queue after close(); just wait for the final write
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put((_STOP, None))
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"[ERROR] audit log writer did not finish within {timeout}s; "
+                      f"about {self._queue.qsize()} entries not written")
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                    thread.start()
+                    self._thread = thread
+
+    # ------------------------------------------------------------------ #
+    #  W R I T E R   T H R E A D
+    # ------------------------------------------------------------------ #
+    def _run(self):
+        pending = []
+        oldest = None  # when the current batch started waiting (or last failed)
+        while True:
+            if len(pending) >= self._queue.maxsize:
+                # Database is down and the retry buffer is full: stop draining the queue
+                # so log() blocks (back-pressure) until a retry gets through.
+                time.sleep(self.flush_interval)
+                pending = self._write(pending)
+                continue
+
+            timeout = None if not pending else max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            attempted = True
+            if item is None:
+                pending = self._write(pending)
+            elif item[0] is _FLUSH:
+                pending = self._write(pending)
+                item[1].set()
+            elif item[0] is _STOP:
+                pending = self._write(pending)
+                if pending:
+                    self._spill(pending)
+                return
+            else:
+                pending.append(item)
+                attempted = len(pending) >= self.batch_size
+                if attempted:
+                    pending = self._write(pending)
+
+            if not pending:
+                oldest = None
+            elif oldest is None or attempted:
+                # New batch, or a failed write: wait another interval before (re)trying
+                oldest = time.monotonic()
+
+    def _write(self, pending):
+        if not pending:
+            return pending
+        try:
+            self._write_batch(pending)
+            return []
+        except Exception as e:
+            if not self._is_permanent(e):
+                print(f"[ERROR] audit log flush failed, will retry: {e}")
+                return pending
+
+        # Something in the batch can never be written: find it entry by entry
+        rejected = []
+        for index, entry in enumerate(pending):
+            try:
+                self._write_batch([entry])
+            except Exception as e:
+                if not self._is_permanent(e):
+                    print(f"[ERROR] audit log flush failed, will retry: {e}")
+                    pending = pending[index:]
+                    break
+                rejected.append(entry)
+        else:
+            pending = []
+        if rejected:
+            self._spill(rejected)
+        return pending
+
+    def _spill(self, entries):
+        try:
+            with open(self.fallback_path, "a", encoding="utf-8") as fallback:
+                for user_id, action, timestamp in entries:
+                    fallback.write(json.dumps({
+                        "user_id": user_id, "action": action, "timestamp": timestamp.isoformat(" ")
+                    }) + "\n")
+            print(f"[ERROR] {len(entries)} audit entries could not be written; saved to {self.fallback_path}")
+        except OSError as e:
+            print(f"[ERROR] {len(entries)} audit entries lost: {e}")
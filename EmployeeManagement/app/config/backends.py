@@ -0,0 +1,209 @@
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+try:
+    import mysql.connector as _mysql
+except ImportError:  # SQLite-only installs don't need the MySQL driver
+    _mysql = None
+
+
+class DatabaseError(Exception):
+    """Application-level database failure (no connection, pool exhausted, ...)."""
+
+
+# Catch-all for `except Error` in the data layer, whichever driver is active
+Error = (DatabaseError, sqlite3.Error) + ((_mysql.Error,) if _mysql else ())
+# Failures caused by the data itself (constraint violation, value too long, ...): retrying can't help
+DataIntegrityError = (sqlite3.IntegrityError, sqlite3.DataError) + (
+    (_mysql.IntegrityError, _mysql.DataError) if _mysql else ()
+)
+
+
+# ====================================================================== #
+#  M Y S Q L
+# ====================================================================== #
+class MySQLBackend:
+    name = "mysql"
+
+    def __init__(self, host="localhost", user="root", password="", database="employee", **options):
+        self.config = dict(host=host, user=user, password=password, database=database, **options)
+        # Buffered by default so a partially read cursor never blocks a pooled connection
+        self.config.setdefault("buffered", True)
+
+    def connect(self):
+        if _mysql is None:
+            raise DatabaseError("mysql-connector-python is not installed")
+        return _mysql.connect(**self.config)
+
+    def is_alive(self, raw):
+        return raw.is_connected()
+
+    def is_duplicate_key(self, err):
+        return getattr(err, "errno", None) == 1062
+
+    def upsert_sql(self, table, columns, key_columns):
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in key_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def increment_sql(self, table, key_columns, counter):
+        """INSERT the (keys..., delta) row, or add delta to the existing counter."""
+        columns = (*key_columns, counter)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {counter} = {counter} + VALUES({counter})")
+
+    # Appended to a SELECT whose result the same transaction's writes depend on; InnoDB
+    # then holds the matching rows, and the gaps around them, until commit
+    for_update = " FOR UPDATE"
+
+    def begin_write(self, cursor):
+        """InnoDB opens the transaction on the first statement; for_update does the locking."""
+
+    def describe(self):
+        return f"mysql://{self.config['user']}@{self.config['host']}/{self.config['database']}"
+
+
+# ====================================================================== #
+#  S Q L I T E
+# ====================================================================== #
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+
+@lru_cache(maxsize=512)
+def _to_qmark(query):
+    """Rewrite the MySQL `%s` paramstyle used throughout the app into SQLite's `?`."""
+    return _PLACEHOLDER.sub(lambda m: "?" if m.group(1) == "s" else "%", query)
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
+
+
+class SQLiteCursor:
+    def __init__(self, raw):
+        self._raw = raw
+
+    def execute(self, query, params=()):
+        self._raw.execute(_to_qmark(query), params)
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self._raw.executemany(_to_qmark(query), seq_of_params)
+        return self
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class SQLiteConnection:
+    """Gives a sqlite3 connection the small slice of the mysql.connector API the app relies on."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._closed = False
+
+    def cursor(self, *args, **kwargs):
+        # mysql.connector options such as buffered= have no SQLite equivalent
+        return SQLiteCursor(self._raw.cursor())
+
+    def is_connected(self):
+        return not self._closed
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._raw.close()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path="employee.db", timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._memory = path == ":memory:"
+        # A private in-memory database must be shared between pooled connections and
+        # kept alive by an anchor connection, otherwise each checkout sees an empty DB.
+        self._target = f"file:employee-{id(self)}?mode=memory&cache=shared" if self._memory else path
+        self._anchor = None
+
+    def connect(self):
+        raw = sqlite3.connect(
+            self._target,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            uri=self._memory,
+        )
+        raw.execute("PRAGMA foreign_keys = ON")
+        raw.create_function("NOW", 0, lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        raw.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        if self._memory and self._anchor is None:
+            self._anchor = sqlite3.connect(self._target, uri=True, check_same_thread=False)
+        elif not self._memory:
+            raw.execute("PRAGMA journal_mode = WAL")
+        return SQLiteConnection(raw)
+
+    def is_alive(self, raw):
+        try:
+            raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def is_duplicate_key(self, err):
+        return isinstance(err, sqlite3.IntegrityError) and "UNIQUE" in str(err)
+
+    def upsert_sql(self, table, columns, key_columns):
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in key_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}")
+
+    def increment_sql(self, table, key_columns, counter):
+        columns = (*key_columns, counter)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {counter} = {counter} + excluded.{counter}")
+
+    for_update = ""  # no row locks; begin_write() takes the database write lock instead
+
+    def begin_write(self, cursor):
+        """Take the write lock before the first read, so nothing changes between read and write."""
+        cursor.execute("BEGIN IMMEDIATE")
+
+    def describe(self):
+        return f"sqlite:///{self.path}"
+
+
+BACKENDS = {
+    MySQLBackend.name: MySQLBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def create_backend(name, **options):
+    try:
+        backend_class = BACKENDS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown database backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    return backend_class(**options)
@@ -0,0 +1,166 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+class TTLCache:
+    """
+    Small thread-safe read-through cache.
+
+    Entries are tagged with the tables they were read from; invalidate(tag) drops
+    every entry carrying that tag and bumps the tag's version, which lets views
+    tell whether data changed since they last rendered it.
+    """
+
+    def __init__(self, default_ttl=300.0):
+        self.default_ttl = default_ttl
+        self._entries = {}  # key -> (expires_at, value, tags)
+        self._versions = {}  # tag -> int
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader, ttl=None, tags=()):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            versions = tuple(self._versions.get(tag, 0) for tag in tags)
+
+        value = loader()
+        if not value:
+            # The data layer reports failed reads as empty results; never pin those
+            return value
+
+        with self._lock:
+            # Don't store a value that was read while a writer invalidated its tags
+            if versions == tuple(self._versions.get(tag, 0) for tag in tags):
+                expires = now + (self.default_ttl if ttl is None else ttl)
+                self._entries[key] = (expires, value, tuple(tags))
+        return value
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if not set(entry[2]) & set(tags)
+            }
+
+    def version(self, tag):
+        with self._lock:
+            return self._versions.get(tag, 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class VersionedCache:
+    """
+    Keeps the latest value per key with the data version it was computed from;
+    get() only returns it while the caller's current version still matches, so
+    entries never go stale and need no TTL. Least recently used keys beyond
+    max_entries are dropped. With `path`, entries are also pickled to that file
+    (by put() at most every save_interval seconds, and by flush() at exit) and
+    reloaded on the next start.
+    """
+
+    def __init__(self, max_entries=64, path=None, save_interval=60.0):
+        self.max_entries = max_entries
+        self.path = path
+        self.save_interval = save_interval
+        self._entries = None  # key -> (version, value), loaded on first use
+        self._dirty = False  # entries changed since the file was last written
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one writer of the file at a time
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as file:
+                    self._entries.update(pickle.load(file))
+            except Exception as e:
+                print(f"[WARN] ignoring unreadable cache file {self.path}: {e}")
+
+    def _write(self, entries):
+        partial = f"{self.path}.part"
+        try:
+            with open(partial, "wb") as file:
+                pickle.dump(entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, self.path)
+        except OSError as e:
+            print(f"[WARN] could not write cache file {self.path}: {e}")
+
+    def flush(self):
+        """Write the entries to `path` if they changed since the last write."""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = dict(self._entries)
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            # Pickled outside _lock so get()/put() on other threads are not held up
+            self._write(entries)
+
+    def get(self, key, version):
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._load()
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            self.flush()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._dirty = True
+        # Written straight away so a restart never reloads what was cleared
+        self.flush()
+
+
+cache = TTLCache()
+# Set EMPLOYEE_REPORT_CACHE to a file path to keep generated reports across restarts
+report_cache = VersionedCache(path=os.environ.get("EMPLOYEE_REPORT_CACHE") or None)
+
+
+def cached(*tags, ttl=None):
+    """
+    Cache a no-argument reader under its own name, e.g.
+
+        @cached("departments")
+        def get_all_departments(): ...
+    """
+    def decorator(func):
+        key = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper():
+            return cache.get_or_load(key, func, ttl=ttl, tags=tags)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -1,23 +1,131 @@
-import mysql.connector
-from mysql.connector import Error
+import atexit
 import hashlib
-from datetime import datetime
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from .audit import AuditLogWriter
+from .backends import Error, DataIntegrityError, DatabaseError, create_backend
+from .cache import cache, cached, report_cache
+from .directory import EmployeeDirectory
+from .instrumentation import InstrumentedConnection, query_stats
+from .migrations import ROLLUP_REBUILD, MigrationError, migrate
+from .pool import ConnectionPool, PoolError
 
 # === Connection ===
+# Backend is chosen by EMPLOYEE_DB_BACKEND ("mysql" or "sqlite") or configure_pool(backend=...)
+DB_BACKEND = os.environ.get("EMPLOYEE_DB_BACKEND", "mysql")
+DB_CONFIG = {
+    "mysql": {
+        "host": "localhost",
+        "user": "root",
+        "password": "",
+        "database": "employee",
+    },
+    "sqlite": {
+        "path": os.environ.get("EMPLOYEE_SQLITE_PATH", "employee.db"),
+    },
+}
+POOL_SIZE = 5
+POOL_TIMEOUT = 30.0
+# Bring the schema up to date (tables + indexes) when the pool is first built
+AUTO_MIGRATE = True
+
+_backend = None
+_pool = None
+_database_identity = None  # (backend description, instance id), read once per pool
+_migration_error = None  # MigrationError from building the pool; kept until configure_pool()
+_pool_lock = threading.Lock()
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _pool_lock:
+            if _backend is None:
+                _backend = create_backend(DB_BACKEND, **DB_CONFIG.get(DB_BACKEND, {}))
+    return _backend
+
+def get_pool():
+    global _pool, _migration_error
+    if _pool is None:
+        if _migration_error is not None:
+            # The data needs fixing by hand first; retrying on every checkout can't help
+            raise _migration_error
+        backend = get_backend()
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(
+                    # Every cursor from the pool is timed (see instrumentation.py)
+                    lambda: InstrumentedConnection(backend.connect()),
+                    size=POOL_SIZE,
+                    timeout=POOL_TIMEOUT,
+                    health_check=backend.is_alive
+                )
+                if AUTO_MIGRATE:
+                    try:
+                        with pool.connection() as connection:
+                            migrate(connection, backend.name)
+                    except MigrationError as e:
+                        pool.close_all()
+                        _migration_error = e
+                        raise
+                    except Exception:
+                        pool.close_all()
+                        raise
+                _pool = pool
+    return _pool
+
+def _shutdown():
+    # Audit entries are flushed through the pool, so it has to close first
+    audit_writer.close()
+    if _pool is not None:
+        _pool.close_all()
+    report_cache.flush()
+
+atexit.register(_shutdown)
+
+def configure_pool(size=None, timeout=None, backend=None, **db_config):
+    """
+    Change backend / pool size / connection settings; the next checkout builds a fresh pool.
+    e.g. configure_pool(backend="sqlite", path=":memory:")
+    """
+    global _backend, _pool, _database_identity, _migration_error, DB_BACKEND, POOL_SIZE, POOL_TIMEOUT
+    with _pool_lock:
+        if backend is not None:
+            DB_BACKEND = backend
+        if size is not None:
+            POOL_SIZE = size
+        if timeout is not None:
+            POOL_TIMEOUT = timeout
+        DB_CONFIG.setdefault(DB_BACKEND, {}).update(db_config)
+        if _pool is not None:
+            _pool.close_all()
+        _backend = None
+        _pool = None
+        _database_identity = None
+        _migration_error = None
+        cache.clear()
+        report_cache.clear()
+        employee_directory.invalidate()
+
 def create_connection():
     try:
-        connection = mysql.connector.connect(
-            host='localhost',
-            user='root',
-            password='',
-            database='employee'
-        )
-        if connection.is_connected():
-            return connection
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        return get_pool().acquire()
+    except (*Error, PoolError) as e:
+        print(f"Error connecting to database: {e}")
         return None
 
+@contextmanager
+def get_connection():
+    """Check a pooled connection out for the duration of a `with` block (None if unavailable)."""
+    connection = create_connection()
+    try:
+        yield connection
+    finally:
+        close_connection(connection)
+
 def close_connection(connection):
     if connection and connection.is_connected():
         connection.close()
@@ -26,6 +134,278 @@ def close_connection(connection):
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
+PAGE_SIZE = 200
+
+def _seek_clause(sort_column, id_column, key, op):
+    """WHERE clause continuing strictly after (op ">") or before (op "<") key = (sort value, id)."""
+    sort_value, last_id = key
+    if sort_column == id_column:
+        return f"{id_column} {op} %s", [last_id]
+    # The leading range on the sort column lets a (sort column, id) index seek straight there
+    return (f"{sort_column} {op}= %s AND ({sort_column} {op} %s OR {id_column} {op} %s)",
+            [sort_value, sort_value, last_id])
+
+def _fetch_window(select_sql, sort_columns, sort, id_column, offset, limit=PAGE_SIZE, descending=False,
+                  after=None, before=None):
+    """
+    Rows [offset, offset + limit) of select_sql for a virtual-scrolling table: ordered by
+    sort_columns[sort] with id_column as tie-breaker, so a row never shows up in two windows.
+    sort must be a key of sort_columns, which maps it to (column, position in the row); only
+    NOT NULL columns with a (column, id) index belong there. Rows carry their id first.
+
+    after / before: the row just ahead of / just behind the window (the edge of a block the
+    table already holds). The window is then found by seeking from that row's (sort value, id)
+    instead of skipping `offset` rows, so it costs the same anywhere in a multi-million-row
+    table; OFFSET is only used for jumps to a position nothing is known about.
+    """
+    if sort not in sort_columns:
+        raise ValueError(f"Cannot sort by {sort!r}")
+    connection = create_connection()
+    if not connection:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        column, position = sort_columns[sort]
+        edge = before if before is not None else after
+        # Rows before `before` are read walking backwards from it, then put back in order
+        backwards = descending != (before is not None)
+        op, direction = ("<", "DESC") if backwards else (">", "ASC")
+        params = []
+        if edge is not None:
+            clause, params = _seek_clause(column, id_column, (edge[position], edge[0]), op)
+            select_sql += f" WHERE {clause}"
+        order_by = f"{id_column} {direction}" if column == id_column else f"{column} {direction}, {id_column} {direction}"
+        if edge is None:
+            cursor.execute(f"{select_sql} ORDER BY {order_by} LIMIT %s OFFSET %s", (*params, limit, offset))
+        else:
+            cursor.execute(f"{select_sql} ORDER BY {order_by} LIMIT %s", (*params, limit))
+        rows = cursor.fetchall()
+        if before is not None:
+            rows.reverse()
+        return rows
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return []
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+def _count_rows(query):
+    connection = create_connection()
+    if not connection:
+        return 0
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        row = cursor.fetchone()
+        return (row[0] or 0) if row else 0
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return 0
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+STREAM_CHUNK_SIZE = 1000
+
+def _stream_rows(query, params=(), chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield rows one by one from an unbuffered cursor, pulling chunk_size rows per
+    fetchmany() so memory stays flat however large the result is. The pooled
+    connection is held until the generator is exhausted or closed. Unlike the
+    list-returning readers, errors propagate so a batch job never mistakes a
+    failed read for a short one.
+    """
+    connection = create_connection()
+    if not connection:
+        raise DatabaseError("Failed to connect to database")
+
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        # A generator closed early leaves rows on the wire; drain them before reuse
+        consume_results = getattr(connection, "consume_results", None)
+        if consume_results:
+            consume_results()
+        cursor.close()
+        close_connection(connection)
+
+BULK_BATCH_SIZE = 1000
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _resolve_employee_ids(cursor, names):
+    """Map employee names to ids with one IN (...) query per BULK_BATCH_SIZE names."""
+    ids = {}
+    for batch in _chunks(list(set(names)), BULK_BATCH_SIZE):
+        placeholders = ", ".join(["%s"] * len(batch))
+        cursor.execute(f"SELECT id, name FROM employees WHERE name IN ({placeholders}) ORDER BY id", tuple(batch))
+        for emp_id, name in cursor.fetchall():
+            ids.setdefault(name, emp_id)  # first (lowest) id wins, like add_attendance
+    return ids
+
+def _write_batches(query, rows, batch_size=BULK_BATCH_SIZE, before_batch=None):
+    """
+    executemany() rows in batches inside a single transaction; rolls back and re-raises on error.
+    before_batch(cursor, batch), if given, runs ahead of each batch in the same transaction,
+    which is opened as a write transaction so its reads can lock with backend.for_update.
+    """
+    connection = create_connection()
+    if not connection:
+        raise DatabaseError("Failed to connect to database")
+
+    cursor = connection.cursor()
+    try:
+        get_backend().begin_write(cursor)
+        for batch in _chunks(rows, batch_size):
+            if before_batch:
+                before_batch(cursor, batch)
+            cursor.executemany(query, batch)
+        connection.commit()
+        return len(rows)
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+# === Rollups ===
+# entity_counts / attendance_daily (migration 3) are updated with the mutator's own cursor
+# before it commits, so a rollup only ever changes together with the rows it counts
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def _bump_count(cursor, entity, delta):
+    if delta:
+        cursor.execute(get_backend().increment_sql("entity_counts", ("entity",), "total"), (entity, delta))
+
+def _bump_attendance_days(cursor, day_counts, sign=1):
+    """day_counts maps a date (or 'YYYY-MM-DD') to a number of rows; sign=-1 subtracts them."""
+    totals = Counter()
+    for day, rows in day_counts.items():
+        totals[_as_date(day)] += rows
+    if totals:
+        # Sorted so concurrent writers lock the day rows in the same order
+        cursor.executemany(
+            get_backend().increment_sql("attendance_daily", ("date",), "total"),
+            [(day, sign * rows) for day, rows in sorted(totals.items())]
+        )
+
+def rebuild_rollups():
+    """Recompute every rollup from the base tables (after edits made outside this module)."""
+    connection = create_connection()
+    if not connection:
+        return False
+
+    cursor = connection.cursor()
+    try:
+        for statement in ROLLUP_REBUILD:
+            cursor.execute(statement)
+        connection.commit()
+        cache.invalidate("employees", "attendance", "payroll", "departments")
+        return True
+    except Error as e:
+        connection.rollback()
+        print(f"[ERROR] {e}")
+        return False
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+# === Data versions ===
+# data_versions (migration 4) holds a counter per key that mutators bump in their own
+# transaction; caches keyed on it (report_cache) stay valid exactly until the data changes.
+# Keys: "employees" (names/rows used by reports), "payroll:<period>" (one payroll period).
+EMPLOYEES_VERSION = "employees"
+
+def _payroll_version(period):
+    return f"payroll:{period}"
+
+def _bump_versions(cursor, *names):
+    names = sorted(set(names))  # same lock order for concurrent writers
+    if names:
+        cursor.executemany(
+            get_backend().increment_sql("data_versions", ("name",), "version"),
+            [(name, 1) for name in names]
+        )
+
+def get_database_identity():
+    """
+    (backend description, instance id) of the connected database. Version counters start
+    at 0 in every database, so caches keyed on them include this too. None if unreadable.
+    """
+    global _database_identity
+    if _database_identity is None:
+        connection = create_connection()
+        if not connection:
+            return None
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT value FROM database_info WHERE name = 'instance_id'")
+            row = cursor.fetchone()
+            if row:
+                _database_identity = (get_backend().describe(), row[0])
+        except Error as e:
+            print(f"[ERROR] {e}")
+        finally:
+            cursor.close()
+            close_connection(connection)
+    return _database_identity
+
+def get_data_versions(*names):
+    """Current version of each name, in order (0 if never bumped); None if it can't be read."""
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(names))
+        cursor.execute(f"SELECT name, version FROM data_versions WHERE name IN ({placeholders})", names)
+        versions = dict(cursor.fetchall())
+        return tuple(versions.get(name, 0) for name in names)
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+def get_data_version_range(first, last):
+    """Sum of the versions of every name in [first, last]; changes whenever any of them is bumped."""
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(SUM(version), 0) FROM data_versions WHERE name BETWEEN %s AND %s",
+                       (first, last))
+        return int(cursor.fetchone()[0])
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
 # === Auth ===
 def register_user(email, username, password):
     connection = create_connection()
@@ -43,9 +423,9 @@ def register_user(email, username, password):
         cursor.execute(sql, (email, username, hashed_pw))
         connection.commit()
         return True, "User registered successfully"
-    except mysql.connector.Error as err:
+    except Error as err:
         print(f"[ERROR] {err}")
-        if err.errno == 1062:
+        if get_backend().is_duplicate_key(err):
             if "email" in str(err).lower():
                 return False, "Email already registered"
             elif "username" in str(err).lower():
@@ -58,7 +438,8 @@ def register_user(email, username, password):
 def login_user(email, password):
     connection = create_connection()
     if not connection:
-        return False, "Failed to connect to database"
+        # A failed migration says what to run; that beats a generic connection error
+        return False, str(_migration_error or "Failed to connect to database")
 
     cursor = connection.cursor()
     try:
@@ -70,13 +451,39 @@ def login_user(email, password):
             return True, {"id": result[0], "username": result[1]}
         else:
             return False, "Email or password incorrect"
-    except mysql.connector.Error as err:
+    except Error as err:
         return False, f"Database error: {err}"
     finally:
         cursor.close()
         close_connection(connection)
 
+def get_user_email(username):
+    with get_connection() as connection:
+        if not connection:
+            return None
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT email FROM users WHERE username = %s", (username,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            cursor.close()
+
+def update_user_profile(username, email, password=None):
+    with get_connection() as connection:
+        if not connection:
+            raise DatabaseError("Failed to connect to database")
+        cursor = connection.cursor()
+        try:
+            cursor.execute("UPDATE users SET email = %s WHERE username = %s", (email, username))
+            if password:
+                cursor.execute("UPDATE users SET password = %s WHERE username = %s", (hash_password(password), username))
+            connection.commit()
+        finally:
+            cursor.close()
+
 # === Employee ===
+@cached("employees")
 def get_all_employees():
     connection = create_connection()
     if not connection:
@@ -86,13 +493,29 @@ def get_all_employees():
     try:
         cursor.execute("SELECT * FROM employees")
         return cursor.fetchall()
-    except mysql.connector.Error as err:
+    except Error as err:
         print(f"[ERROR] {err}")
         return []
     finally:
         cursor.close()
         close_connection(connection)
 
+# Sortable columns of the virtual tables: name -> (column, position in the window row).
+# Only indexed NOT NULL columns, so every block is an index seek (see _fetch_window).
+EMPLOYEE_SORTS = {"id": ("id", 0), "name": ("name", 1)}
+
+def count_employees():
+    # From the rollup: one row read instead of a full COUNT(*)
+    return _count_rows("SELECT total FROM entity_counts WHERE entity = 'employees'")
+
+def get_employees_window(offset, limit=PAGE_SIZE, sort=None, descending=False, after=None, before=None):
+    # Rows are (id, name, position, department, status); default order is by id
+    return _fetch_window("SELECT id, name, position, department, status FROM employees",
+                         EMPLOYEE_SORTS, sort or "id", "id", offset, limit, descending, after, before)
+
+def iter_employees(chunk_size=STREAM_CHUNK_SIZE):
+    return _stream_rows("SELECT * FROM employees ORDER BY id", chunk_size=chunk_size)
+
 def add_employee(name, position, department, status):
     connection = create_connection()
     if not connection:
@@ -104,9 +527,12 @@ def add_employee(name, position, department, status):
             "INSERT INTO employees (name, position, department, status) VALUES (%s, %s, %s, %s)",
             (name, position, department, status)
         )
+        _bump_count(cursor, "employees", 1)
         connection.commit()
+        cache.invalidate("employees")
+        employee_directory.put(cursor.lastrowid, name)
         return True
-    except mysql.connector.Error as err:
+    except Error as err:
         print(f"[ERROR] {err}")
         return False
     finally:
@@ -118,12 +544,34 @@ def delete_employee(emp_id):
     if not connection:
         return False
 
+    backend = get_backend()
     cursor = connection.cursor()
     try:
+        # Attendance and payroll rows go with the employee (ON DELETE CASCADE). Lock the employee
+        # first, so no rows can be added for them meanwhile, then the rows the rollups subtract.
+        backend.begin_write(cursor)
+        cursor.execute(f"SELECT id FROM employees WHERE id = %s{backend.for_update}", (emp_id,))
+        cursor.fetchall()
+        cursor.execute(
+            f"SELECT DATE(date), COUNT(*) FROM attendance WHERE employee_id = %s GROUP BY DATE(date)"
+            f"{backend.for_update}",
+            (emp_id,)
+        )
+        attendance_days = dict(cursor.fetchall())
+        cursor.execute(f"SELECT COUNT(*) FROM payroll WHERE employee_id = %s{backend.for_update}", (emp_id,))
+        payroll_rows = cursor.fetchone()[0]
         cursor.execute("DELETE FROM employees WHERE id = %s", (emp_id,))
+        if cursor.rowcount:
+            _bump_count(cursor, "employees", -1)
+            _bump_count(cursor, "payroll", -payroll_rows)
+            _bump_attendance_days(cursor, attendance_days, sign=-1)
+            _bump_versions(cursor, EMPLOYEES_VERSION)
         connection.commit()
+        cache.invalidate("employees", "attendance", "payroll")
+        employee_directory.remove(emp_id)
         return True
-    except mysql.connector.Error as err:
+    except Error as err:
+        connection.rollback()
         print(f"[ERROR] {err}")
         return False
     finally:
@@ -141,16 +589,70 @@ def update_employee(emp_id, name, position, department, status):
             "UPDATE employees SET name=%s, position=%s, department=%s, status=%s WHERE id=%s",
             (name, position, department, status, emp_id)
         )
+        _bump_versions(cursor, EMPLOYEES_VERSION)
         connection.commit()
+        cache.invalidate("employees")
+        employee_directory.put(emp_id, name)
         return True
-    except mysql.connector.Error as err:
+    except Error as err:
         print(f"[ERROR] {err}")
         return False
     finally:
         cursor.close()
         close_connection(connection)
 
+def _load_employee_directory():
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT id, name FROM employees")
+        return cursor.fetchall()
+    except Error as err:
+        print(f"[ERROR] {err}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+employee_directory = EmployeeDirectory(_load_employee_directory)
+
+def resolve_employee_id(name):
+    """Employee id for a name from the in-memory directory, asking the database only on a miss."""
+    emp_id = employee_directory.id_for(name)
+    if emp_id is not None:
+        return emp_id
+
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT id FROM employees WHERE name = %s ORDER BY id LIMIT 1", (name,))
+        result = cursor.fetchone()
+        if not result:
+            return None
+        employee_directory.put(result[0], name)
+        return result[0]
+    except Error as err:
+        print(f"[ERROR] {err}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+def get_employee_name(emp_id):
+    return employee_directory.name_for(emp_id)
+
+@cached("employees")
+def get_employees_by_id():
+    return {emp[0]: emp for emp in get_all_employees()}
+
 # === Departments ===
+@cached("departments")
 def get_all_departments():
     connection = create_connection()
     if not connection:
@@ -178,7 +680,9 @@ def add_department(department_name, manager):
             "INSERT INTO departments (department_name, manager) VALUES (%s, %s)",
             (department_name, manager)
         )
+        _bump_count(cursor, "departments", 1)
         connection.commit()
+        cache.invalidate("departments")
         return True
     except Error as e:
         print(f"[ERROR] {e}")
@@ -199,6 +703,7 @@ def update_department(dep_id, department_name, manager):
             (department_name, manager, dep_id)
         )
         connection.commit()
+        cache.invalidate("departments")
         return True
     except Error as e:
         print(f"[ERROR] {e}")
@@ -215,7 +720,9 @@ def delete_department(dep_id):
     cursor = connection.cursor()
     try:
         cursor.execute("DELETE FROM departments WHERE id=%s", (dep_id,))
+        _bump_count(cursor, "departments", -cursor.rowcount)
         connection.commit()
+        cache.invalidate("departments")
         return True
     except Error as e:
         print(f"[ERROR] {e}")
@@ -246,24 +753,64 @@ def get_all_attendance():
         cursor.close()
         close_connection(connection)
 
+ATTENDANCE_SORTS = {"date": ("a.date", 6)}
+
+def count_attendance():
+    return _count_rows("SELECT SUM(total) FROM attendance_daily")
+
+def get_attendance_window(offset, limit=PAGE_SIZE, sort=None, descending=False, after=None, before=None):
+    # Rows match get_all_attendance; default order is newest first
+    if sort is None:
+        sort, descending = "date", True
+    return _fetch_window("""
+            SELECT a.id, e.name, a.status, a.checkin_time, a.checkout_time, a.notes, a.date
+            FROM attendance a
+            JOIN employees e ON a.employee_id = e.id
+        """, ATTENDANCE_SORTS, sort, "a.id", offset, limit, descending, after, before)
+
+def iter_attendance(date_from=None, date_to=None, chunk_size=STREAM_CHUNK_SIZE):
+    # Same row shape as get_all_attendance, optionally limited to [date_from, date_to]
+    query = """
+        SELECT a.id, e.name, a.status, a.checkin_time, a.checkout_time, a.notes, a.date
+        FROM attendance a
+        JOIN employees e ON a.employee_id = e.id
+        WHERE 1 = 1
+    """
+    params = []
+    if date_from is not None:
+        query += " AND a.date >= %s"
+        params.append(date_from)
+    if date_to is not None:
+        query += " AND a.date <= %s"
+        params.append(date_to)
+    query += " ORDER BY a.date DESC, a.id DESC"
+    return _stream_rows(query, tuple(params), chunk_size)
+
 def add_attendance(name, status, checkin, checkout, notes, date):
+    employee_id = resolve_employee_id(name)
+    if employee_id is None:
+        print("[ERROR] Employee not found")
+        return False
+    try:
+        # Checked before the INSERT: the attendance_daily rollup has to file the row under a day
+        _as_date(date)
+    except ValueError as e:
+        print(f"[ERROR] Invalid attendance date {date!r}: {e}")
+        return False
+
     connection = create_connection()
     if not connection:
         return False
 
     cursor = connection.cursor()
     try:
-        cursor.execute("SELECT id FROM employees WHERE name = %s", (name,))
-        result = cursor.fetchone()
-        if not result:
-            print("[ERROR] Employee not found")
-            return False
-        employee_id = result[0]
         cursor.execute("""
             INSERT INTO attendance (employee_id, status, checkin_time, checkout_time, notes, date)
             VALUES (%s, %s, %s, %s, %s, %s)
         """, (employee_id, status, checkin, checkout, notes, date))
+        _bump_attendance_days(cursor, {date: 1})
         connection.commit()
+        cache.invalidate("attendance")
         return True
     except Error as e:
         print(f"[ERROR] {e}")
@@ -272,6 +819,54 @@ def add_attendance(name, status, checkin, checkout, notes, date):
         cursor.close()
         close_connection(connection)
 
+def add_attendance_bulk(records, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert many attendance rows in one transaction.
+    records: iterable of (name, status, checkin, checkout, notes, date) like add_attendance.
+    Returns (inserted_count, rejected) where rejected are records with an unknown employee name.
+    """
+    records = list(records)
+    if not records:
+        return 0, []
+
+    connection = create_connection()
+    if not connection:
+        raise DatabaseError("Failed to connect to database")
+
+    cursor = connection.cursor()
+    try:
+        names = [r[0] for r in records]
+        ids = employee_directory.ids_for(names)
+        missing = set(names) - ids.keys()
+        if missing:
+            # Employees added by another process since the directory was loaded
+            found = _resolve_employee_ids(cursor, missing)
+            for name, emp_id in found.items():
+                employee_directory.put(emp_id, name)
+            ids.update(found)
+        rows, rejected = [], []
+        for name, status, checkin, checkout, notes, date in records:
+            if name in ids:
+                rows.append((ids[name], status, checkin, checkout, notes, date))
+            else:
+                rejected.append((name, status, checkin, checkout, notes, date))
+
+        for batch in _chunks(rows, batch_size):
+            cursor.executemany("""
+                INSERT INTO attendance (employee_id, status, checkin_time, checkout_time, notes, date)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, batch)
+        _bump_attendance_days(cursor, Counter(row[5] for row in rows))
+        connection.commit()
+        cache.invalidate("attendance")
+        return len(rows), rejected
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        close_connection(connection)
+
 def delete_attendance_by_id(att_id):
     connection = create_connection()
     if not connection:
@@ -279,8 +874,13 @@ def delete_attendance_by_id(att_id):
 
     cursor = connection.cursor()
     try:
+        cursor.execute("SELECT date FROM attendance WHERE id = %s", (att_id,))
+        row = cursor.fetchone()
         cursor.execute("DELETE FROM attendance WHERE id = %s", (att_id,))
+        if row and cursor.rowcount:
+            _bump_attendance_days(cursor, {row[0]: 1}, sign=-1)
         connection.commit()
+        cache.invalidate("attendance")
         return True
     except Error as e:
         print(f"[ERROR] {e}")
@@ -289,6 +889,7 @@ def delete_attendance_by_id(att_id):
         cursor.close()
         close_connection(connection)
 
+@cached("employees")
 def get_all_employee_names():
     connection = create_connection()
     if not connection:
@@ -316,24 +917,117 @@ def get_all_payroll():
                FROM payroll p
                JOIN employees e ON p.employee_id = e.id
                ORDER BY p.period DESC"""
-    cursor.execute(query)
-    results = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return results
+    try:
+        cursor.execute(query)
+        return cursor.fetchall()
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return []
+    finally:
+        cursor.close()
+        close_connection(conn)
+
+PAYROLL_SORTS = {"period": ("p.period", 1)}
+
+def count_payroll():
+    return _count_rows("SELECT total FROM entity_counts WHERE entity = 'payroll'")
+
+def get_payroll_window(offset, limit=PAGE_SIZE, sort=None, descending=False, after=None, before=None):
+    # Rows match get_all_payroll; default order is latest period first
+    if sort is None:
+        sort, descending = "period", True
+    return _fetch_window("""
+            SELECT p.id, p.period, e.name, p.base_salary, p.bonus, p.deductions, p.net_pay, p.status
+            FROM payroll p
+            JOIN employees e ON p.employee_id = e.id
+        """, PAYROLL_SORTS, sort, "p.id", offset, limit, descending, after, before)
+
+def iter_payroll(period=None, chunk_size=STREAM_CHUNK_SIZE):
+    # Same row shape as get_all_payroll, optionally for a single period
+    query = """
+        SELECT p.id, p.period, e.name, p.base_salary, p.bonus, p.deductions, p.net_pay, p.status
+        FROM payroll p
+        JOIN employees e ON p.employee_id = e.id
+    """
+    params = ()
+    if period is not None:
+        query += " WHERE p.period = %s"
+        params = (period,)
+    query += " ORDER BY p.period DESC, p.id DESC"
+    return _stream_rows(query, params, chunk_size)
+
+ACTIVE_EMPLOYEE_STATUS = "active"  # matched case-insensitively against employees.status
+
+def iter_payroll_run_inputs(period, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Pay components of every active employee for a payroll run, one row each:
+    (employee_id, base_salary, bonus, deductions, status). Values already entered
+    for the period win; otherwise base_salary is the employee's basic_salary,
+    bonus/deductions are 0 and status is None.
+    """
+    return _stream_rows("""
+        SELECT e.id, COALESCE(p.base_salary, e.basic_salary), COALESCE(p.bonus, 0),
+               COALESCE(p.deductions, 0), p.status
+        FROM employees e
+        LEFT JOIN payroll p ON p.employee_id = e.id AND p.period = %s
+        WHERE LOWER(e.status) = %s
+        ORDER BY e.id
+    """, (period, ACTIVE_EMPLOYEE_STATUS), chunk_size)
 
 def calculate_net_pay(base_salary, bonus, deductions):
     return base_salary + bonus - deductions
 
 def insert_payroll(employee_id, period, base_salary, bonus, deductions, net_pay, status):
     conn = create_connection()
+    if not conn:
+        return False
+
     cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO payroll (employee_id, period, base_salary, bonus, deductions, net_pay, status)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """, (employee_id, period, base_salary, bonus, deductions, net_pay, status))
-    conn.commit()
-    conn.close()
+    try:
+        cursor.execute("""
+            INSERT INTO payroll (employee_id, period, base_salary, bonus, deductions, net_pay, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, (employee_id, period, base_salary, bonus, deductions, net_pay, status))
+        _bump_count(cursor, "payroll", 1)
+        _bump_versions(cursor, _payroll_version(period))
+        conn.commit()
+        cache.invalidate("payroll")
+        return True
+    except Error as e:
+        conn.rollback()
+        print(f"[ERROR] {e}")
+        return False
+    finally:
+        cursor.close()
+        close_connection(conn)
+
+PAYROLL_COLUMNS = ("employee_id", "period", "base_salary", "bonus", "deductions", "net_pay", "status")
+
+def _before_payroll_batch(cursor, batch):
+    # Only keys not already in the table add to the payroll count; updates leave it alone.
+    # The keys stay locked until commit, so a concurrent upsert cannot count them as new too.
+    keys = sorted({(row[1], row[0]) for row in batch})
+    placeholders = ", ".join(["(%s, %s)"] * len(keys))
+    cursor.execute(
+        f"SELECT COUNT(*) FROM payroll WHERE (period, employee_id) IN ({placeholders}){get_backend().for_update}",
+        tuple(value for key in keys for value in key)
+    )
+    _bump_count(cursor, "payroll", len(keys) - cursor.fetchone()[0])
+    _bump_versions(cursor, *(_payroll_version(period) for period, _ in keys))
+
+def upsert_payroll_bulk(records, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert or update many payroll rows in one transaction, keyed on (employee_id, period).
+    records: iterable of (employee_id, period, base_salary, bonus, deductions, net_pay, status).
+    Returns the number of records written.
+    """
+    records = [tuple(r) for r in records]
+    if not records:
+        return 0
+    query = get_backend().upsert_sql("payroll", PAYROLL_COLUMNS, ("employee_id", "period"))
+    written = _write_batches(query, records, batch_size, before_batch=_before_payroll_batch)
+    cache.invalidate("payroll")
+    return written
 
 def update_payroll(payroll_id, employee_id, period, base_salary, bonus, deductions, net_pay, status):
     connection = create_connection()
@@ -341,12 +1035,18 @@ def update_payroll(payroll_id, employee_id, period, base_salary, bonus, deductio
         return False
     try:
         cursor = connection.cursor()
+        # The row may move to another period; both reports change
+        cursor.execute("SELECT period FROM payroll WHERE id = %s", (payroll_id,))
+        periods = [row[0] for row in cursor.fetchall()]
         cursor.execute("""
             UPDATE payroll
             SET employee_id=%s, period=%s, base_salary=%s, bonus=%s, deductions=%s, net_pay=%s, status=%s
             WHERE id=%s
         """, (employee_id, period, base_salary, bonus, deductions, net_pay, status, payroll_id))
+        if cursor.rowcount:
+            _bump_versions(cursor, *(_payroll_version(p) for p in periods + [period]))
         connection.commit()
+        cache.invalidate("payroll")
         return cursor.rowcount > 0
     except Exception as e:
         print("Error updating payroll:", e)
@@ -355,6 +1055,25 @@ def update_payroll(payroll_id, employee_id, period, base_salary, bonus, deductio
         cursor.close()
         connection.close()
 
+def delete_payroll(payroll_id):
+    with get_connection() as connection:
+        if not connection:
+            raise DatabaseError("Failed to connect to database")
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT period FROM payroll WHERE id = %s", (payroll_id,))
+            periods = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM payroll WHERE id = %s", (payroll_id,))
+            deleted = cursor.rowcount
+            _bump_count(cursor, "payroll", -deleted)
+            if deleted:
+                _bump_versions(cursor, *(_payroll_version(p) for p in periods))
+            connection.commit()
+            cache.invalidate("payroll")
+            return deleted > 0
+        finally:
+            cursor.close()
+
 def get_payroll_by_id(payroll_id):
     connection = create_connection()
     if not connection:
@@ -400,6 +1119,191 @@ def get_payroll_summary_by_period(period):
         cursor.close()
         conn.close()
 
+def get_payroll_report(period, use_cache=True):
+    """
+    get_payroll_summary_by_period served from report_cache while neither that period's
+    payroll nor the employees changed. Costs one small version lookup when cached.
+    """
+    versions = get_data_versions(_payroll_version(period), EMPLOYEES_VERSION)
+    database = get_database_identity()
+    key = (database, "payroll_summary", period)
+    if database is None:
+        versions = None  # can't tell which database the cache would be for
+    if use_cache and versions is not None:
+        rows = report_cache.get(key, versions)
+        if rows is not None:
+            return rows
+
+    rows = [tuple(row) for row in get_payroll_summary_by_period(period)]
+    # Failed reads come back empty too; only cache what we know is real
+    if rows and versions is not None:
+        report_cache.put(key, versions, rows)
+    return rows
+
+def iter_payroll_summary_by_period(period, chunk_size=STREAM_CHUNK_SIZE):
+    # Streaming twin of get_payroll_summary_by_period
+    return _stream_rows("""
+        SELECT e.name, p.base_salary, p.bonus, p.deductions, p.net_pay
+        FROM payroll p
+        JOIN employees e ON p.employee_id = e.id
+        WHERE p.period = %s
+        ORDER BY e.name ASC
+    """, (period,), chunk_size)
+
+# Row label of a range report: (group key, label) columns, grouped on the key
+PAYROLL_RANGE_GROUPS = {
+    False: ("e.id", "e.name"),
+    True: ("e.department", "e.department"),
+}
+
+def _load_payroll_range(period_from, period_to, by_department):
+    key, label = PAYROLL_RANGE_GROUPS[by_department]
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        # Periods are 'YYYY-MM', so a string range is a calendar range
+        cursor.execute(f"""
+            SELECT {key}, {label}, p.period, SUM(p.net_pay)
+            FROM payroll p
+            JOIN employees e ON p.employee_id = e.id
+            WHERE p.period BETWEEN %s AND %s
+            GROUP BY {key}, {label}, p.period
+            ORDER BY {label}, {key}, p.period
+        """, (period_from, period_to))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"[ERROR] _load_payroll_range: {e}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+def get_payroll_range_report(period_from, period_to, by_department=False, use_cache=True):
+    """
+    Net pay for every period in [period_from, period_to], pivoted to one row per employee
+    (or department) and one column per period, aggregated by a single GROUP BY query:
+
+        {"periods": ["2025-01", ...], "rows": [(label, net per period..., total), ...]}
+
+    Missing cells are 0. Cached like get_payroll_report while no period in the range and
+    no employee changed. Returns None if the data can't be read.
+    """
+    versions = (get_data_version_range(_payroll_version(period_from), _payroll_version(period_to)),
+                get_data_versions(EMPLOYEES_VERSION))
+    database = get_database_identity()
+    cache_key = (database, "payroll_range", period_from, period_to, by_department)
+    cacheable = None not in versions and database is not None
+    if use_cache and cacheable:
+        report = report_cache.get(cache_key, versions)
+        if report is not None:
+            return report
+
+    rows = _load_payroll_range(period_from, period_to, by_department)
+    if rows is None:
+        return None
+
+    periods = sorted({period for _, _, period, _ in rows})
+    column = {period: index for index, period in enumerate(periods)}
+    groups = {}  # key -> [label, cells]; insertion order follows the query's label order
+    for key, label, period, net in rows:
+        group = groups.setdefault(key, [label, [0] * len(periods)])
+        group[1][column[period]] = net
+    report = {
+        "periods": periods,
+        "rows": [(label if label is not None else "(none)", *cells, sum(cells))
+                 for label, cells in groups.values()],
+    }
+    if rows and cacheable:
+        report_cache.put(cache_key, versions, report)
+    return report
+
+# === Dashboard ===
+def get_attendance_daily_counts(date_from, date_to):
+    """[(date, attendance rows)] for every day in [date_from, date_to], zero-filled, from the daily rollup."""
+    date_from, date_to = _as_date(date_from), _as_date(date_to)
+    by_day = {date_from + timedelta(days=n): 0 for n in range((date_to - date_from).days + 1)}
+
+    connection = create_connection()
+    if not connection:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT date, total FROM attendance_daily WHERE date >= %s AND date <= %s",
+            (date_from, date_to)
+        )
+        for day, total in cursor.fetchall():
+            by_day[_as_date(day)] = total
+        return sorted(by_day.items())
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return []
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+DASHBOARD_STATS_TTL = 30.0  # seconds; writes to the counted tables invalidate sooner
+
+def _load_dashboard_stats(days=7):
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+
+    connection = create_connection()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        # Every card value and the per-day series in one round trip, read from the rollups:
+        # a handful of rows however much history the base tables hold
+        cursor.execute("""
+            SELECT 'attendance_day', date, total
+            FROM attendance_daily
+            WHERE date >= %s AND date < %s
+            UNION ALL
+            SELECT entity, NULL, total FROM entity_counts
+        """, (first_day, today + timedelta(days=1)))
+        rows = cursor.fetchall()
+    except Error as e:
+        print(f"[ERROR] {e}")
+        return None
+    finally:
+        cursor.close()
+        close_connection(connection)
+
+    by_day = {first_day + timedelta(days=n): 0 for n in range(days)}
+    counts = {}
+    for kind, day, total in rows:
+        if kind == "attendance_day":
+            by_day[_as_date(day)] = total
+        else:
+            counts[kind] = total
+    stats = {
+        "employees": counts.get("employees", 0),
+        "payrolls": counts.get("payroll", 0),
+        "departments": counts.get("departments", 0),
+    }
+    stats["attendance_today"] = by_day[today]
+    stats["attendance_by_day"] = sorted(by_day.items())
+    return stats
+
+def get_dashboard_stats(use_cache=True):
+    """
+    Overview card values and the last-7-days attendance series:
+    {"employees", "attendance_today", "payrolls", "departments", "attendance_by_day": [(date, count), ...]}
+    Returns None if the database is unreachable.
+    """
+    if not use_cache:
+        return _load_dashboard_stats()
+    return cache.get_or_load(
+        "dashboard_stats", _load_dashboard_stats, ttl=DASHBOARD_STATS_TTL,
+        tags=("employees", "attendance", "payroll", "departments")
+    )
+
 # === Audit Logs ===
 def get_audit_logs():
     conn = create_connection()
@@ -421,19 +1325,35 @@ def get_audit_logs():
         cursor.close()
         conn.close()
 
-def log_action(user_id, action):
-    conn = create_connection()
-    if not conn:
-        return
-    cursor = conn.cursor()
+def iter_audit_logs(chunk_size=STREAM_CHUNK_SIZE):
+    return _stream_rows("""
+        SELECT a.timestamp, u.username, a.action
+        FROM audit_logs a
+        JOIN users u ON a.user_id = u.id
+        ORDER BY a.timestamp DESC, a.id DESC
+    """, chunk_size=chunk_size)
+
+def _insert_audit_logs(entries):
+    connection = create_connection()
+    if not connection:
+        raise DatabaseError("Failed to connect to database")
+
+    cursor = connection.cursor()
     try:
-        cursor.execute("""
+        cursor.executemany("""
             INSERT INTO audit_logs (user_id, action, timestamp)
-            VALUES (%s, %s, NOW())
-        """, (user_id, action))
-        conn.commit()
-    except Exception as e:
-        print("[ERROR] log_action:", e)
+            VALUES (%s, %s, %s)
+        """, entries)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
     finally:
         cursor.close()
-        conn.close()
+        close_connection(connection)
+
+audit_writer = AuditLogWriter(_insert_audit_logs, is_permanent=lambda e: isinstance(e, DataIntegrityError))
+
+def log_action(user_id, action):
+    # Queued and written in batches by a background thread (see audit.py)
+    audit_writer.log(user_id, action)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+
+class EmployeeDirectory:
+    """
+    In-memory two-way id <-> name index of employees.
+
+    Loaded lazily in one query, patched in place by the employee writers and
+    reloaded after max_age seconds to pick up writes from other processes.
+    Several employees may share a name; id_for() returns the lowest id, which is
+    what `SELECT id FROM employees WHERE name = %s` used to give back.
+    """
+
+    def __init__(self, loader, max_age=300.0):
+        self._loader = loader  # callable returning [(id, name), ...] or None on failure
+        self.max_age = max_age
+        self._names = {}  # id -> name
+        self._ids = {}  # name -> set of ids
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return
+            rows = self._loader()
+            if rows is None:
+                return
+            self._names, self._ids = {}, {}
+            for emp_id, name in rows:
+                self._add(emp_id, name)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, emp_id, name):
+        self._names[emp_id] = name
+        self._ids.setdefault(name, set()).add(emp_id)
+
+    def _discard(self, emp_id):
+        name = self._names.pop(emp_id, None)
+        if name is not None:
+            ids = self._ids.get(name)
+            ids.discard(emp_id)
+            if not ids:
+                del self._ids[name]
+
+    # ------------------------------------------------------------------ #
+    #  L O O K U P S
+    # ------------------------------------------------------------------ #
+    def id_for(self, name):
+        with self._lock:
+            self._ensure_loaded()
+            ids = self._ids.get(name)
+            return min(ids) if ids else None
+
+    def ids_for(self, names):
+        """{name: id} for the names that are known; unknown names are left out."""
+        with self._lock:
+            self._ensure_loaded()
+            return {name: min(self._ids[name]) for name in set(names) if name in self._ids}
+
+    def name_for(self, emp_id):
+        with self._lock:
+            self._ensure_loaded()
+            return self._names.get(emp_id)
+
+    # ------------------------------------------------------------------ #
+    #  W R I T E   H O O K S
+    # ------------------------------------------------------------------ #
+    def put(self, emp_id, name):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # the first lookup will load it from the database
+            self._discard(emp_id)
+            self._add(emp_id, name)
+
+    def remove(self, emp_id):
+        with self._lock:
+            self._discard(emp_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._names, self._ids = {}, {}
+            self._loaded_at = None
@@ -0,0 +1,292 @@
+"""
+Timing for every statement sent through the connection pool.
+
+Each cursor handed out by a pooled connection is an InstrumentedCursor: it
+measures execute + fetch time, counts rows and finds the calling function,
+feeds per-query-shape statistics and writes statements slower than
+SLOW_QUERY_MS to the slow-query log.
+
+The per-shape table (count, p50/p95/p99, rows) is appended to the same log when
+the process exits, or on demand with log_report(). Print the latest one with:
+
+    python -m app.config.instrumentation [--log slow_queries.log]
+"""
+import argparse
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+
+SLOW_QUERY_MS = float(os.environ.get("EMPLOYEE_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.environ.get("EMPLOYEE_SLOW_QUERY_LOG", "slow_queries.log")
+SAMPLES_PER_SHAPE = 1000  # latest latencies kept per query shape for percentiles
+# Set EMPLOYEE_QUERY_REPORT=0 to skip writing the per-shape table at exit
+QUERY_REPORT_AT_EXIT = os.environ.get("EMPLOYEE_QUERY_REPORT", "1") != "0"
+REPORT_TITLE = "query stats"
+
+_CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_slow_logger = logging.getLogger("employee.slow_query")
+_slow_logger.propagate = False
+_slow_logger_ready = False
+_slow_logger_lock = threading.Lock()
+
+
+def configure(slow_query_ms=None, log_path=None):
+    global SLOW_QUERY_MS, SLOW_QUERY_LOG, _slow_logger_ready
+    if slow_query_ms is not None:
+        SLOW_QUERY_MS = slow_query_ms
+    if log_path is not None:
+        SLOW_QUERY_LOG = log_path
+        for handler in list(_slow_logger.handlers):
+            _slow_logger.removeHandler(handler)
+            handler.close()
+        _slow_logger_ready = False
+
+
+def _log_slow(message):
+    global _slow_logger_ready
+    with _slow_logger_lock:
+        if not _slow_logger_ready:
+            handler = logging.FileHandler(SLOW_QUERY_LOG, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            _slow_logger.addHandler(handler)
+            _slow_logger.setLevel(logging.INFO)
+            _slow_logger_ready = True
+    _slow_logger.info(message)
+
+
+# ====================================================================== #
+#  S T A T S
+# ====================================================================== #
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*%s(\s*,\s*%s)*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+
+
+def query_shape(sql):
+    """Normalise a statement so `IN (%s, %s)` and `IN (%s)` (and literals) group together."""
+    shape = _WHITESPACE.sub(" ", sql).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("(...)", shape)
+
+
+def _percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes = {}
+
+    def record(self, shape, elapsed_ms, rows, caller, failed=False):
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is None:
+                entry = self._shapes[shape] = {
+                    "count": 0, "errors": 0, "rows": 0, "total_ms": 0.0,
+                    "samples": deque(maxlen=SAMPLES_PER_SHAPE), "callers": set(),
+                }
+            entry["count"] += 1
+            entry["errors"] += failed
+            entry["rows"] += rows
+            entry["total_ms"] += elapsed_ms
+            entry["samples"].append(elapsed_ms)
+            entry["callers"].add(caller)
+
+    def snapshot(self):
+        """One dict per query shape, slowest total time first."""
+        with self._lock:
+            items = [(shape, dict(entry, samples=sorted(entry["samples"]), callers=sorted(entry["callers"])))
+                     for shape, entry in self._shapes.items()]
+        report = []
+        for shape, entry in items:
+            samples = entry["samples"]
+            report.append({
+                "query": shape,
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "rows": entry["rows"],
+                "total_ms": entry["total_ms"],
+                "mean_ms": entry["total_ms"] / entry["count"],
+                "p50_ms": _percentile(samples, 0.50),
+                "p95_ms": _percentile(samples, 0.95),
+                "p99_ms": _percentile(samples, 0.99),
+                "max_ms": samples[-1],
+                "callers": entry["callers"],
+            })
+        return sorted(report, key=lambda r: r["total_ms"], reverse=True)
+
+    def format_report(self, limit=20):
+        lines = [f"{'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rows':>9}  query"]
+        for r in self.snapshot()[:limit]:
+            lines.append(f"{r['count']:>7} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+                         f"{r['rows']:>9}  {r['query'][:120]}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+
+
+query_stats = QueryStats()
+
+
+def log_report(limit=20):
+    """Append query_stats.format_report() to the slow-query log; False if nothing has run yet."""
+    if not query_stats.snapshot():
+        return False
+    _log_slow(f"{REPORT_TITLE} ({os.getpid()}):\n{query_stats.format_report(limit)}")
+    return True
+
+
+@atexit.register
+def _log_report_at_exit():
+    if QUERY_REPORT_AT_EXIT:
+        log_report()
+
+
+# ====================================================================== #
+#  W R A P P E R S
+# ====================================================================== #
+def _find_caller():
+    """First frame outside the data-layer plumbing (private helpers in app/config)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        in_config = os.path.dirname(os.path.abspath(code.co_filename)) == _CONFIG_DIR
+        if not in_config or (not code.co_name.startswith("_") and code.co_name not in ("execute", "executemany")):
+            module = frame.f_globals.get("__name__", "?")
+            return f"{module}.{code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+class InstrumentedCursor:
+    def __init__(self, raw):
+        self._raw = raw
+        self._pending = None  # [shape, elapsed_ms, rows_fetched, caller, failed] of the last statement
+
+    def _run(self, method, query, params):
+        self._finish()
+        caller = _find_caller()
+        started = time.perf_counter()
+        failed = False
+        try:
+            return method(query, params)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self._pending = [query_shape(query), elapsed, 0, caller, failed]
+            if failed:
+                self._finish()
+
+    def execute(self, query, params=()):
+        return self._run(self._raw.execute, query, params)
+
+    def executemany(self, query, seq_of_params):
+        return self._run(self._raw.executemany, query, seq_of_params)
+
+    def _fetch(self, method, *args, single=False):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._pending is not None:
+            self._pending[1] += (time.perf_counter() - started) * 1000
+            if single:
+                self._pending[2] += result is not None
+            else:
+                self._pending[2] += len(result)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._raw.fetchone, single=True)
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._raw.fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._fetch(self._raw.fetchall)
+
+    def _finish(self):
+        if self._pending is None:
+            return
+        shape, elapsed, fetched, caller, failed = self._pending
+        self._pending = None
+        # Writes report affected rows through rowcount; reads through what was fetched
+        rowcount = getattr(self._raw, "rowcount", -1)
+        rows = fetched or max(rowcount if rowcount is not None else 0, 0)
+        query_stats.record(shape, elapsed, rows, caller, failed)
+        if elapsed >= SLOW_QUERY_MS:
+            _log_slow(f"{elapsed:.1f} ms rows={rows} caller={caller}{' FAILED' if failed else ''} sql={shape}")
+
+    def close(self):
+        self._finish()
+        return self._raw.close()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class InstrumentedConnection:
+    """Driver connection whose cursors are timed; everything else passes straight through."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+# ====================================================================== #
+#  C L I
+# ====================================================================== #
+_LOG_RECORD = re.compile(r"^\d{4}-\d{2}-\d{2} ")  # asctime prefix of every log record
+
+
+def last_report(log_path):
+    """Return the newest per-shape table written to the slow-query log, or None."""
+    report = None
+    with open(log_path, encoding="utf-8") as log:
+        for line in log:
+            if _LOG_RECORD.match(line):
+                # Continuation lines of a report never start with a timestamp
+                report = [line] if f" {REPORT_TITLE} (" in line else None
+            elif report is not None:
+                report.append(line)
+    return "".join(report).rstrip() if report else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the latest query stats from the slow-query log.")
+    parser.add_argument("--log", default=SLOW_QUERY_LOG, help=f"slow-query log (default: {SLOW_QUERY_LOG})")
+    args = parser.parse_args(argv)
+    try:
+        report = last_report(args.log)
+    except OSError as e:
+        print(f"[ERROR] {e}")
+        return 2
+    if report is None:
+        print(f"No query stats in {args.log} yet; they are written when the app exits.")
+        return 1
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,478 @@
+"""
+Versioned schema migrations for every supported backend.
+
+Each migration is (version, description, steps) where steps maps a dialect
+("mysql" / "sqlite") to a list of SQL statements and Index definitions.
+Applied versions are recorded in `schema_migrations`, so running migrate()
+again is a no-op. Run `python -m app.config.migrations` to migrate by hand.
+"""
+from collections import namedtuple
+from datetime import datetime
+
+from .backends import DatabaseError
+
+
+class MigrationError(DatabaseError):
+    """A migration can't be applied to the data as it is; the message says what to do."""
+
+
+class Index(namedtuple("Index", "table name columns unique")):
+    """
+    Created only when no existing index already covers it: for a plain index one that
+    leads with the same columns, for a unique one a unique index on exactly these columns.
+    """
+
+    def __new__(cls, table, name, columns, unique=False):
+        return super().__new__(cls, table, name, tuple(columns), unique)
+
+
+MYSQL_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        username VARCHAR(100) NOT NULL UNIQUE,
+        password CHAR(64) NOT NULL
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS departments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        department_name VARCHAR(100) NOT NULL,
+        manager VARCHAR(100)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS employees (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        position VARCHAR(100),
+        department VARCHAR(100),
+        status VARCHAR(50),
+        basic_salary DECIMAL(12, 2) NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        employee_id INT NOT NULL,
+        status VARCHAR(20),
+        checkin_time VARCHAR(16),
+        checkout_time VARCHAR(16),
+        notes TEXT,
+        date DATE NOT NULL,
+        FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS payroll (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        employee_id INT NOT NULL,
+        period VARCHAR(7) NOT NULL,
+        base_salary DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        bonus DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        deductions DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        net_pay DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        status VARCHAR(20),
+        FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        action VARCHAR(255) NOT NULL,
+        timestamp DATETIME NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+    """,
+]
+
+SQLITE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        username TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS departments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        department_name TEXT NOT NULL,
+        manager TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        position TEXT,
+        department TEXT,
+        status TEXT,
+        basic_salary DECIMAL(12, 2) NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+        status TEXT,
+        checkin_time TEXT,
+        checkout_time TEXT,
+        notes TEXT,
+        date DATE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS payroll (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+        period TEXT NOT NULL,
+        base_salary DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        bonus DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        deductions DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        net_pay DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        status TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        action TEXT NOT NULL,
+        timestamp DATETIME NOT NULL
+    )
+    """,
+]
+
+# Indexes backing the hot queries:
+#   attendance  WHERE date >= ... / ORDER BY date DESC     -> (date, employee_id)
+#   payroll     WHERE period = %s, upsert on (employee_id, period) -> unique (period, employee_id)
+#   employees   WHERE name = %s / name IN (...)            -> (name)
+#   users       WHERE email = %s AND password = %s         -> (email)
+#   audit_logs  ORDER BY timestamp DESC                    -> (timestamp)
+HOT_QUERY_INDEXES = [
+    Index("attendance", "idx_attendance_date_employee", ["date", "employee_id"]),
+    Index("payroll", "uq_payroll_period_employee", ["period", "employee_id"], unique=True),
+    Index("employees", "idx_employees_name", ["name"]),
+    Index("users", "idx_users_email", ["email"]),
+    Index("audit_logs", "idx_audit_logs_timestamp", ["timestamp"]),
+]
+PAYROLL_KEY_INDEX = HOT_QUERY_INDEXES[1]
+
+# Keeps the newest row of every (period, employee_id) group; see `--dedupe-payroll` below.
+# The derived table lets MySQL read the table it deletes from.
+DEDUPE_PAYROLL = """
+    DELETE FROM payroll WHERE id NOT IN (
+        SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM payroll GROUP BY period, employee_id) AS keep
+    )
+"""
+
+# Rollups maintained by the data-layer mutators (see "Rollups" in database.py):
+#   entity_counts     one row per counted table -> the overview cards read 3 rows, not 3 full scans
+#   attendance_daily  attendance rows per day   -> date-range charts read one row per day
+MYSQL_ROLLUP_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS entity_counts (
+        entity VARCHAR(32) PRIMARY KEY,
+        total BIGINT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_daily (
+        date DATE PRIMARY KEY,
+        total INT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB
+    """,
+]
+
+SQLITE_ROLLUP_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS entity_counts (
+        entity TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_daily (
+        date DATE PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+# Recomputes every rollup from the base tables (initial backfill, or repair after out-of-band edits)
+ROLLUP_REBUILD = [
+    "DELETE FROM entity_counts",
+    "DELETE FROM attendance_daily",
+    """
+    INSERT INTO entity_counts (entity, total)
+    SELECT 'employees', COUNT(*) FROM employees
+    UNION ALL SELECT 'payroll', COUNT(*) FROM payroll
+    UNION ALL SELECT 'departments', COUNT(*) FROM departments
+    """,
+    # DATE() so a legacy DATETIME attendance.date still gives one row per day
+    "INSERT INTO attendance_daily (date, total) SELECT DATE(date), COUNT(*) FROM attendance GROUP BY DATE(date)",
+]
+
+# Monotonic per-key change counters bumped by the data-layer mutators, e.g. "payroll:2025-06"
+# after any write to that period. Kept in the database so caches stay valid across restarts
+# and across every client sharing the database (see "Data versions" in database.py).
+MYSQL_DATA_VERSION_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name VARCHAR(64) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB
+    """,
+]
+
+SQLITE_DATA_VERSION_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+# The virtual tables order by (sort column, id) and seek from a known row (see _fetch_window
+# in database.py); an index on exactly that pair makes every block an index range scan.
+# employees (name) already ends in the primary key implicitly on both engines.
+KEYSET_INDEXES = [
+    Index("attendance", "idx_attendance_date_id", ["date", "id"]),
+    Index("payroll", "idx_payroll_period_id", ["period", "id"]),
+]
+
+# Deleting an employee reads (and cascades to) their attendance and payroll rows. InnoDB
+# indexes foreign keys by itself, so this only adds anything on SQLite, which otherwise
+# scans both tables for every employee delete.
+EMPLOYEE_KEY_INDEXES = [
+    Index("attendance", "idx_attendance_employee", ["employee_id"]),
+    Index("payroll", "idx_payroll_employee", ["employee_id"]),
+]
+
+# A random id per database, so caches that outlive a connection (report_cache on disk)
+# can tell a recreated or different database from the one they were filled from
+MYSQL_INSTANCE_ID = [
+    """
+    CREATE TABLE IF NOT EXISTS database_info (
+        name VARCHAR(64) PRIMARY KEY,
+        value VARCHAR(255) NOT NULL
+    ) ENGINE=InnoDB
+    """,
+    "INSERT INTO database_info (name, value) VALUES ('instance_id', REPLACE(UUID(), '-', ''))",
+]
+
+SQLITE_INSTANCE_ID = [
+    """
+    CREATE TABLE IF NOT EXISTS database_info (
+        name TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    "INSERT INTO database_info (name, value) VALUES ('instance_id', lower(hex(randomblob(16))))",
+]
+
+MIGRATIONS = [
+    (1, "Base tables", {"mysql": MYSQL_TABLES, "sqlite": SQLITE_TABLES}),
+    (2, "Indexes for hot queries", {"mysql": HOT_QUERY_INDEXES, "sqlite": HOT_QUERY_INDEXES}),
+    (3, "Rollup tables", {"mysql": MYSQL_ROLLUP_TABLES + ROLLUP_REBUILD,
+                          "sqlite": SQLITE_ROLLUP_TABLES + ROLLUP_REBUILD}),
+    (4, "Data versions", {"mysql": MYSQL_DATA_VERSION_TABLES, "sqlite": SQLITE_DATA_VERSION_TABLES}),
+    # Databases migrated before _create_index checked uniqueness may have skipped it in migration 2;
+    # with duplicate payroll rows both fall back to a plain index until --dedupe-payroll is run
+    (5, "Unique payroll key", {"mysql": [PAYROLL_KEY_INDEX], "sqlite": [PAYROLL_KEY_INDEX]}),
+    (6, "Database instance id", {"mysql": MYSQL_INSTANCE_ID, "sqlite": SQLITE_INSTANCE_ID}),
+    (7, "Keyset paging indexes", {"mysql": KEYSET_INDEXES, "sqlite": KEYSET_INDEXES}),
+    (8, "Employee foreign key indexes", {"mysql": EMPLOYEE_KEY_INDEXES, "sqlite": EMPLOYEE_KEY_INDEXES}),
+    # Migration 3 grouped by the raw date, one row per timestamp on a DATETIME column
+    (9, "Per-day attendance rollup", {"mysql": ROLLUP_REBUILD, "sqlite": ROLLUP_REBUILD}),
+]
+
+
+# ====================================================================== #
+#  R U N N E R
+# ====================================================================== #
+def _ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """)
+
+
+def _index_columns(cursor, dialect, table):
+    """Return {index_name: ([columns in order], unique)} for a table."""
+    indexes = {}
+    if dialect == "mysql":
+        cursor.execute("""
+            SELECT index_name, column_name, non_unique
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s
+            ORDER BY index_name, seq_in_index
+        """, (table,))
+        for name, column, non_unique in cursor.fetchall():
+            indexes.setdefault(name, ([], not non_unique))[0].append(column)
+    else:
+        cursor.execute(f"PRAGMA index_list({table})")
+        for name, unique in [(row[1], bool(row[2])) for row in cursor.fetchall()]:
+            cursor.execute(f"PRAGMA index_info({name})")
+            indexes[name] = ([row[2] for row in cursor.fetchall()], unique)
+    return indexes
+
+
+def _duplicate_message(index, duplicates):
+    columns = ", ".join(index.columns)
+    examples = "; ".join(", ".join(str(value) for value in row[:-1]) for row in duplicates[:3])
+    fix = ("Run `python -m app.config.migrations --dedupe-payroll` to keep the newest row of each."
+           if index.table == "payroll" else "Remove the extra rows, then run the migrations again.")
+    return (f"Cannot create unique index {index.name}: {len(duplicates)} ({columns}) value(s) of "
+            f"{index.table} occur more than once (e.g. {examples}). {fix}")
+
+
+def _find_duplicates(cursor, index):
+    """Rows (key values..., count) of every key that occurs more than once."""
+    columns = ", ".join(index.columns)
+    cursor.execute(f"""
+        SELECT {columns}, COUNT(*) FROM {index.table}
+        GROUP BY {columns} HAVING COUNT(*) > 1
+    """)
+    return cursor.fetchall()
+
+
+def _plain_index(index):
+    """The non-unique stand-in for a unique index that existing rows break."""
+    return Index(index.table, index.name.replace("uq_", "idx_", 1), index.columns)
+
+
+def _create_index(cursor, dialect, index, strict=False):
+    """
+    A unique index that existing duplicates break is created as _plain_index() instead,
+    so the app keeps starting; with strict=True that raises MigrationError instead.
+    """
+    existing = _index_columns(cursor, dialect, index.table)
+    width = len(index.columns)
+    for cols, unique in existing.values():
+        if index.unique and unique and tuple(cols) == index.columns:
+            return
+        if not index.unique and tuple(cols[:width]) == index.columns:
+            return
+    if index.unique:
+        duplicates = _find_duplicates(cursor, index)
+        if duplicates and strict:
+            raise MigrationError(_duplicate_message(index, duplicates))
+        if duplicates:
+            plain = _plain_index(index)
+            print(f"[WARN] {_duplicate_message(index, duplicates)} Created {plain.name} without "
+                  f"the unique key until then.")
+            _create_index(cursor, dialect, plain)
+            return
+    unique = "UNIQUE " if index.unique else ""
+    cursor.execute(f"CREATE {unique}INDEX {index.name} ON {index.table} ({', '.join(index.columns)})")
+
+
+def _drop_index(cursor, dialect, index):
+    if index.name in _index_columns(cursor, dialect, index.table):
+        on_table = f" ON {index.table}" if dialect == "mysql" else ""
+        cursor.execute(f"DROP INDEX {index.name}{on_table}")
+
+
+def current_version(connection):
+    cursor = connection.cursor()
+    try:
+        _ensure_version_table(cursor)
+        cursor.execute("SELECT MAX(version) FROM schema_migrations")
+        row = cursor.fetchone()
+        return (row[0] or 0) if row else 0
+    finally:
+        cursor.close()
+
+
+def migrate(connection, dialect, target=None):
+    """Apply every pending migration up to `target` (default: latest). Returns the applied versions."""
+    applied = []
+    version = current_version(connection)
+    cursor = connection.cursor()
+    try:
+        for number, description, steps in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            for step in steps[dialect]:
+                if isinstance(step, Index):
+                    _create_index(cursor, dialect, step)
+                else:
+                    cursor.execute(step)
+            # MySQL DDL commits implicitly, so each migration is recorded as soon as it lands
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                (number, description, datetime.now())
+            )
+            connection.commit()
+            applied.append(number)
+        return applied
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def dedupe_payroll(connection, dialect):
+    """
+    Delete all but the newest (highest id) payroll row of every (period, employee_id), then
+    create the unique payroll key in place of the plain index a migration fell back to.
+    Returns the number of rows removed.
+    """
+    version = current_version(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(DEDUPE_PAYROLL)
+        removed = cursor.rowcount
+        if removed and version >= 3:
+            for statement in ROLLUP_REBUILD:
+                cursor.execute(statement)
+        if removed and version >= 4:
+            # Cached reports of any period may include the removed rows
+            cursor.execute("UPDATE data_versions SET version = version + 1 WHERE name LIKE 'payroll:%'")
+        connection.commit()
+        if version >= 5:
+            _create_index(cursor, dialect, PAYROLL_KEY_INDEX, strict=True)
+            _drop_index(cursor, dialect, _plain_index(PAYROLL_KEY_INDEX))
+            connection.commit()
+        return removed
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.config.database import get_backend
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--dedupe-payroll", action="store_true",
+                        help="first delete duplicate payroll rows, keeping the newest of each employee/period")
+    args = parser.parse_args()
+
+    # Straight to the driver: the pool would auto-migrate before we get here
+    backend = get_backend()
+    conn = backend.connect()
+    try:
+        if args.dedupe_payroll:
+            removed = dedupe_payroll(conn, backend.name)
+            print(f"{backend.describe()}: removed {removed} duplicate payroll row(s)")
+        try:
+            done = migrate(conn, backend.name)
+        except MigrationError as e:
+            raise SystemExit(f"[ERROR] {e}")
+        print(f"{backend.describe()}: applied {done or 'nothing'}, now at version {current_version(conn)}")
+    finally:
+        conn.close()
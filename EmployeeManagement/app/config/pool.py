@@ -0,0 +1,172 @@
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolError(Exception):
+    pass
+
+
+class PoolTimeoutError(PoolError):
+    pass
+
+
+class PooledConnection:
+    """
+    Proxy around a driver connection checked out from a ConnectionPool.
+    close() hands the connection back to the pool instead of dropping the socket,
+    so existing `conn.close()` call sites keep working unchanged. A proxy that is
+    garbage-collected without close() still returns its connection (rolled back).
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+        self._finalizer = weakref.finalize(self, pool.release, raw)
+
+    def is_connected(self):
+        # No server ping here: the pool already health-checks on checkout.
+        return not self._released
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._finalizer()  # runs pool.release(raw) at most once
+
+    def __getattr__(self, name):
+        if self._released:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of database connections.
+
+    factory        -- callable returning a new driver connection
+    size           -- maximum number of open connections
+    timeout        -- seconds to wait for a free connection before giving up
+    health_check   -- callable(raw) -> bool, run on checkout of connections idle
+                      for longer than check_interval seconds
+    """
+
+    def __init__(self, factory, size=5, timeout=30.0, health_check=None, check_interval=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._health_check = health_check
+        self.check_interval = check_interval
+
+        self._idle = deque()  # (raw connection, last used timestamp)
+        self._checked_out = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    # ------------------------------------------------------------------ #
+    #  C H E C K O U T
+    # ------------------------------------------------------------------ #
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        raw, last_used = None, None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                if self._idle:
+                    # LIFO keeps the warmest connections in use
+                    raw, last_used = self._idle.pop()
+                    break
+                if self._checked_out < self.size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No free connection after {timeout:.1f}s (pool size {self.size})")
+                self._cond.wait(remaining)
+            self._checked_out += 1
+
+        try:
+            if raw is not None and time.monotonic() - last_used > self.check_interval:
+                if not self._is_healthy(raw):
+                    self._close_raw(raw)
+                    raw = None
+            if raw is None:
+                raw = self._factory()
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if getattr(raw, "in_transaction", False):
+                raw.rollback()
+        except Exception:
+            self._close_raw(raw)
+            raw = None
+
+        with self._cond:
+            self._checked_out -= 1
+            if raw is not None and not self._closed:
+                self._idle.append((raw, time.monotonic()))
+                raw = None
+            self._cond.notify()
+
+        if raw is not None:
+            self._close_raw(raw)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------ #
+    #  M A I N T E N A N C E
+    # ------------------------------------------------------------------ #
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "idle": len(self._idle), "in_use": self._checked_out}
+
+    def _is_healthy(self, raw):
+        if self._health_check is None:
+            return True
+        try:
+            return bool(self._health_check(raw))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -1,5 +1,6 @@
 
-from app.config.database import get_payroll_summary_by_period
+from app.config.database import get_payroll_report
+from app.utils.background import run_in_background
 from app.views.report import ReportView
 
 
@@ -9,6 +10,8 @@ class ReportController:
         self.report_view = ReportView(master)
 
     def generate_report(self, period):
-        # Mengambil data laporan dari database
-        results = get_payroll_summary_by_period(period)
-        self.report_view.update_report_table(results)
+        # Mengambil data laporan dari database (di thread latar belakang)
+        run_in_background(
+            self.report_view, get_payroll_report, period,
+            on_done=self.report_view.update_report_table
+        )
@@ -1,8 +1,5 @@
 import ttkbootstrap as tb
-from views.login_view import LoginView
-from views.register_view import RegisterView
-from views.dashboard_view import DashboardView
-import ttkbootstrap as tb
+from app.utils import background
 from views.login_view import LoginView
 from views.register_view import RegisterView
 
@@ -13,8 +10,16 @@ class App(tb.Window):
         self.geometry("1700x900")
         self.current_view = None
         self.current_username = None # Added
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.show_login()
 
+    def on_close(self):
+        # Let running exports / payroll runs finish writing before the database pool and the
+        # audit writer are shut down at exit
+        self.withdraw()
+        background.shutdown()
+        self.destroy()
+
     def clear_view(self):
         if self.current_view:
             self.current_view.destroy()
@@ -32,6 +37,9 @@ class App(tb.Window):
         self.current_view = RegisterView(self, switch_to_login=self.show_login)
 
     def show_dashboard(self, username: str): # Modified signature
+        # Imported on first login, not at startup: keeps the login window's cold start small
+        from views.dashboard_view import DashboardView
+
         self.clear_view()
         self.current_username = username # Store username
         self.current_view = DashboardView(self, username=username) # Pass username
@@ -0,0 +1,199 @@
+"""
+Bulk attendance import from time-clock (badge system) CSV files.
+
+The file is streamed: rows are validated as they are read and written through
+add_attendance_bulk() IMPORT_BATCH_SIZE at a time, each batch in its own
+transaction, so a punch file of any size is imported in constant memory.
+Rows that fail validation or name an unknown employee are copied to a
+rejected-rows CSV (input columns plus line and reason).
+
+    python -m app.utils.attendance_importer punches.csv [--rejected out.csv] [--batch-size 2000]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from app.config import Error, add_attendance_bulk
+
+IMPORT_BATCH_SIZE = 2000  # rows per transaction (and per progress report)
+DEFAULT_STATUS = "Present"
+MAX_STATUS_LENGTH = 20  # attendance.status is VARCHAR(20)
+
+# Accepted header spellings (compared lower-cased and trimmed) per attendance field
+COLUMN_ALIASES = {
+    "name": ("name", "employee", "employee name", "employee_name"),
+    "date": ("date", "work date", "work_date", "day"),
+    "checkin": ("check-in", "checkin", "check in", "check_in", "clock in", "clock_in", "in"),
+    "checkout": ("check-out", "checkout", "check out", "check_out", "clock out", "clock_out", "out"),
+    "status": ("status",),
+    "notes": ("notes", "note", "remarks", "comment"),
+}
+REQUIRED_COLUMNS = ("name", "date", "checkin")
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M:%S %p", "%I:%M%p")
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d")
+
+ImportResult = namedtuple("ImportResult", "rows imported rejected rejected_file seconds")
+
+
+@lru_cache(maxsize=4096)  # punch times repeat heavily, so most rows skip strptime
+def parse_time(value):
+    """'9:05', '09:05:30', '9:05 PM' -> '09:05' (the form the attendance screens use)."""
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%H:%M")
+        except ValueError:
+            pass
+    raise ValueError(f"invalid time {value!r}")
+
+
+@lru_cache(maxsize=1024)
+def parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    raise ValueError(f"invalid date {value!r}")
+
+
+def _column_positions(header):
+    names = [column.strip().lower() for column in header]
+    positions = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                positions[field] = names.index(alias)
+                break
+    missing = [field for field in REQUIRED_COLUMNS if field not in positions]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)} (header: {', '.join(header)})")
+    return positions
+
+
+def parse_row(row, positions):
+    """Return (name, status, checkin, checkout, notes, date) for add_attendance_bulk; raises ValueError."""
+    def field(name):
+        index = positions.get(name)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    name = field("name")
+    if not name:
+        raise ValueError("missing employee name")
+    if not field("date"):
+        raise ValueError("missing date")
+    if not field("checkin"):
+        raise ValueError("missing check-in time")
+    date = parse_date(field("date"))
+    checkin = parse_time(field("checkin"))
+    checkout = parse_time(field("checkout")) if field("checkout") else ""
+    # Zero-padded HH:MM compares chronologically; overnight shifts are not supported by the schema
+    if checkout and checkout < checkin:
+        raise ValueError(f"check-out {checkout} is before check-in {checkin}")
+    status = field("status") or DEFAULT_STATUS
+    if len(status) > MAX_STATUS_LENGTH:
+        raise ValueError(f"status longer than {MAX_STATUS_LENGTH} characters")
+    return name, status, checkin, checkout, field("notes"), date
+
+
+def default_rejected_path(path):
+    base, _ = os.path.splitext(path)
+    return f"{base}.rejected.csv"
+
+
+def import_attendance(path, rejected_path=None, batch_size=IMPORT_BATCH_SIZE, progress=None, encoding="utf-8-sig"):
+    """
+    Import a time-clock CSV. progress(rows_read, imported, rejected) is called after every
+    batch. Returns an ImportResult; rejected_file is None when every row was imported.
+    Batches already written stay written if a later one fails.
+    """
+    started = time.perf_counter()
+    rejected_path = rejected_path or default_rejected_path(path)
+    rows_read = imported = rejected = 0
+    rejected_file = rejected_writer = None
+    header = []
+
+    def reject(line, row, reason):
+        nonlocal rejected, rejected_file, rejected_writer
+        if rejected_writer is None:
+            # Only create the file once there is something to put in it
+            rejected_file = open(rejected_path, "w", newline="", encoding="utf-8")
+            rejected_writer = csv.writer(rejected_file)
+            rejected_writer.writerow([*header, "line", "reason"])
+        rejected_writer.writerow([*row, line, reason])
+        rejected += 1
+
+    def flush(pending):
+        nonlocal imported
+        written, unknown = add_attendance_bulk([record for _, _, record in pending], batch_size)
+        imported += written
+        unknown_names = {record[0] for record in unknown}
+        for line, row, record in pending:
+            if record[0] in unknown_names:
+                reject(line, row, "unknown employee")
+        if progress:
+            progress(rows_read, imported, rejected)
+
+    try:
+        with open(path, newline="", encoding=encoding) as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("file is empty")
+            positions = _column_positions(header)
+
+            pending = []  # (line, raw row, record)
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue  # blank line
+                rows_read += 1
+                try:
+                    pending.append((reader.line_num, row, parse_row(row, positions)))
+                except ValueError as e:
+                    reject(reader.line_num, row, str(e))
+                if len(pending) >= batch_size:
+                    flush(pending)
+                    pending = []
+            if pending:
+                flush(pending)
+    finally:
+        if rejected_file:
+            rejected_file.close()
+
+    return ImportResult(
+        rows=rows_read,
+        imported=imported,
+        rejected=rejected,
+        rejected_file=rejected_path if rejected else None,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--rejected", help="where to write rejected rows (default: <file>.rejected.csv)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    def report(rows_read, imported, rejected):
+        print(f"{rows_read:,} rows read, {imported:,} imported, {rejected:,} rejected")
+
+    try:
+        result = import_attendance(args.path, args.rejected, args.batch_size, progress=report)
+    except (OSError, ValueError, *Error) as e:
+        print(f"[ERROR] {e}")
+        return 2
+
+    print(f"{result.imported:,} of {result.rows:,} rows imported in {result.seconds:.2f}s")
+    if result.rejected_file:
+        print(f"{result.rejected:,} rejected rows written to {result.rejected_file}")
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
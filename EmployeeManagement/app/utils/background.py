@@ -0,0 +1,87 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# Database calls run here so a slow query never blocks the Tk mainloop.
+# Tk is not thread-safe: workers only put finished futures on a queue, and the
+# main thread drains it from an after() poll and runs the callbacks itself.
+MAX_WORKERS = 4
+POLL_INTERVAL_MS = 30
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="db-worker")
+_finished = queue.SimpleQueue()
+_ui_calls = queue.SimpleQueue()  # (widget, func, args) posted by workers via call_on_ui()
+_pollers = {}  # Tk root -> number of tasks still pending for it
+
+
+def run_in_background(widget, func, *args, on_done=None, on_error=None, **kwargs):
+    """
+    Run func(*args, **kwargs) on the worker pool. on_done(result) or on_error(exc)
+    is later called on the Tk thread, and skipped if `widget` was destroyed meanwhile.
+    Must be called from the Tk thread.
+    """
+    root = widget._root()
+    future = _executor.submit(func, *args, **kwargs)
+    future.add_done_callback(lambda f: _finished.put((widget, f, on_done, on_error)))
+
+    _pollers[root] = _pollers.get(root, 0) + 1
+    if _pollers[root] == 1:
+        root.after(POLL_INTERVAL_MS, _drain, root)
+    return future
+
+
+def call_on_ui(widget, func, *args):
+    """
+    From a worker task: run func(*args) on the Tk thread at the next poll, e.g. to
+    report progress. Skipped if `widget` was destroyed meanwhile.
+    """
+    _ui_calls.put((widget, func, args))
+
+
+def _drain(root):
+    # Posted calls first, so a task's last progress update lands before its on_done
+    while True:
+        try:
+            widget, func, args = _ui_calls.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            if widget.winfo_exists():
+                func(*args)
+        except Exception as e:
+            print(f"[ERROR] UI callback failed: {e!r}")
+
+    while True:
+        try:
+            widget, future, on_done, on_error = _finished.get_nowait()
+        except queue.Empty:
+            break
+        widget_root = widget._root()
+        _pollers[widget_root] -= 1
+        try:
+            if not widget.winfo_exists():
+                continue
+        except tk.TclError:
+            continue
+
+        error = future.exception()
+        try:
+            if error is None:
+                if on_done:
+                    on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                print(f"[ERROR] background task failed: {error!r}")
+        except Exception as e:
+            print(f"[ERROR] background callback failed: {e!r}")
+
+    if _pollers.get(root):
+        root.after(POLL_INTERVAL_MS, _drain, root)
+    else:
+        _pollers.pop(root, None)
+
+
+def shutdown(wait=True):
+    """Stop taking tasks; wait=True lets queued and running ones finish (App.on_close)."""
+    _executor.shutdown(wait=wait, cancel_futures=not wait)
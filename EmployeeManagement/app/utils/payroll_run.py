@@ -0,0 +1,81 @@
+"""
+Batch payroll run: computes a whole period for every active employee in one
+vectorised pandas/NumPy pass and writes it with a single bulk upsert.
+
+    python -m app.utils.payroll_run 2025-06
+"""
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from app.config import PAYROLL_COLUMNS, iter_payroll_run_inputs, upsert_payroll_bulk
+
+INPUT_COLUMNS = ["employee_id", "base_salary", "bonus", "deductions", "status"]
+MONEY_COLUMNS = ["base_salary", "bonus", "deductions"]
+DEFAULT_STATUS = "Pending"
+SETTLED_STATUS = "paid"  # rows already paid out are never recomputed; matched case-insensitively
+PERIOD_FORMAT = "%Y-%m"
+
+PayrollRunResult = namedtuple("PayrollRunResult", "period employees written skipped total_net_pay seconds")
+
+
+def parse_period(value):
+    """'2025-06' (or '2025-6') -> '2025-06'; raises ValueError for anything that is not YYYY-MM."""
+    try:
+        return datetime.strptime(value.strip(), PERIOD_FORMAT).strftime(PERIOD_FORMAT)
+    except ValueError:
+        raise ValueError(f"invalid payroll period {value!r}, expected YYYY-MM (e.g. 2025-06)") from None
+
+
+def compute_payroll(rows, period, default_status=DEFAULT_STATUS):
+    """
+    rows: (employee_id, base_salary, bonus, deductions, status) as from iter_payroll_run_inputs.
+    Returns a DataFrame with PAYROLL_COLUMNS, net pay computed for all rows at once.
+    """
+    # pandas/numpy are only needed once a run actually starts
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(list(rows), columns=INPUT_COLUMNS)
+    # Money is summed as int64 cents so net pay is exact, not float-rounded
+    cents = (frame[MONEY_COLUMNS].astype("float64").fillna(0.0) * 100).round().astype("int64")
+    net_cents = cents["base_salary"] + cents["bonus"] - cents["deductions"]
+
+    frame[MONEY_COLUMNS] = cents / 100
+    frame["net_pay"] = net_cents / 100
+    frame["status"] = frame["status"].fillna(default_status)
+    frame["period"] = period
+    return frame[list(PAYROLL_COLUMNS)]
+
+
+def run_payroll(period, default_status=DEFAULT_STATUS):
+    """Compute and store `period` for every active employee; one transaction for the whole write."""
+    started = time.perf_counter()
+    period = parse_period(period)
+    frame = compute_payroll(iter_payroll_run_inputs(period), period, default_status)
+
+    # No salary on file, or already paid: leave those employees alone
+    payable = frame[(frame["base_salary"] > 0) & (frame["status"].str.lower() != SETTLED_STATUS)]
+    # tolist() hands the driver plain Python ints/floats/strs instead of NumPy scalars
+    records = list(zip(*(payable[column].tolist() for column in PAYROLL_COLUMNS)))
+    written = upsert_payroll_bulk(records)
+
+    return PayrollRunResult(
+        period=period,
+        employees=len(frame),
+        written=written,
+        skipped=len(frame) - len(payable),
+        total_net_pay=float(payable["net_pay"].sum()),
+        seconds=time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        raise SystemExit("usage: python -m app.utils.payroll_run YYYY-MM")
+    try:
+        result = run_payroll(sys.argv[1])
+    except ValueError as e:
+        raise SystemExit(f"[ERROR] {e}")
+    print(f"{result.period}: {result.written} of {result.employees} employees written, "
+          f"{result.skipped} skipped, net pay ${result.total_net_pay:,.2f} in {result.seconds:.2f}s")
@@ -1,38 +1,212 @@
 import csv
-import pandas as pd
-from tkinter import filedialog, messagebox
+import os
+from datetime import date
+from decimal import Decimal
+from itertools import islice
 
-def export_to_csv(treeview, filename):
+from app.config import get_payroll_range_report, iter_attendance, iter_payroll_summary_by_period
+
+REPORT_HEADER = ["Employee Name", "Base Salary", "Bonus", "Deductions", "Net Pay"]
+EXPORT_CHUNK_SIZE = 5000  # rows written (and reported to progress) per step
+ROW_GROUP_SIZE = 50000  # rows per Parquet row group / Arrow record batch
+
+# Columnar exports: (column name, type) in query order; money is exact DECIMAL(12, 2) as in the database
+PAYROLL_SUMMARY_COLUMNS = [
+    ("employee_name", "string"), ("base_salary", "money"), ("bonus", "money"),
+    ("deductions", "money"), ("net_pay", "money"),
+]
+ATTENDANCE_COLUMNS = [
+    ("id", "int"), ("employee_name", "string"), ("status", "string"), ("checkin_time", "string"),
+    ("checkout_time", "string"), ("notes", "string"), ("date", "date"),
+]
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def _write_atomically(filename, write):
+    """Run write(path) against a temporary file and move it into place only if it succeeds."""
+    partial = f"{filename}.part"
     try:
-        with open(filename, mode="w", newline="") as file:
+        result = write(partial)
+        os.replace(partial, filename)
+        return result
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+def _close(rows):
+    close = getattr(rows, "close", None)  # release a streaming cursor's connection early
+    if close:
+        close()
+
+def write_csv(rows, filename, header=REPORT_HEADER, progress=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write rows (any iterable, typically a streaming DB cursor) to filename chunk_size
+    rows at a time, so memory stays flat however many rows there are. Numbers are
+    written as the driver returns them. progress(rows_written) is called after each
+    chunk. Returns the number of rows written; raises on failure.
+    """
+    def write(path):
+        written = 0
+        with open(path, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
+            writer.writerow(header)
+            for batch in _batches(rows, chunk_size):
+                writer.writerows(batch)
+                written += len(batch)
+                if progress:
+                    progress(written)
+        return written
 
-            # Write the header row
-            writer.writerow(["Employee Name", "Base Salary", "Bonus", "Deductions", "Net Pay"])
+    try:
+        return _write_atomically(filename, write)
+    finally:
+        _close(rows)
+
+def export_payroll_summary_csv(period, filename, progress=None):
+    """Stream one period's payroll summary from the database straight to CSV."""
+    return write_csv(iter_payroll_summary_by_period(period), filename, progress=progress)
+
+def write_xlsx(rows, filename, header=REPORT_HEADER, progress=None, chunk_size=EXPORT_CHUNK_SIZE,
+               sheet_title="Report", number_format="#,##0.00"):
+    """
+    Streaming counterpart of write_csv() for Excel: an openpyxl write-only workbook
+    flushes each row to disk as it is appended instead of keeping a cell grid in memory.
+    Numeric values become numeric cells (formatted with number_format), text stays text.
+    """
+    # openpyxl is only imported when someone actually exports
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
 
-            # Write data from the table
-            for row in treeview.get_children():
-                values = treeview.item(row)["values"]
-                writer.writerow([value.replace("$", "").replace(",", "") for value in values])
+    def write(path):
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_title)
+        sheet.freeze_panes = "A2"
 
-        messagebox.showinfo("Success", f"Report successfully exported to {filename}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to export report:\n{e}")
+        def cell(value, **style):
+            c = WriteOnlyCell(sheet, value=value)
+            for name, style_value in style.items():
+                setattr(c, name, style_value)
+            return c
+
+        sheet.append([cell(title, font=Font(bold=True)) for title in header])
+        numeric = None  # column positions holding numbers, taken from the first row
+        written = 0
+        for batch in _batches(rows, chunk_size):
+            if numeric is None:
+                numeric = {i for i, value in enumerate(batch[0])
+                           if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)}
+            for row in batch:
+                sheet.append([cell(value, number_format=number_format) if i in numeric and value is not None
+                              else value for i, value in enumerate(row)])
+            written += len(batch)
+            if progress:
+                progress(written)
+        workbook.save(path)
+        return written
 
-def export_to_excel(treeview, filename):
     try:
-        # Prepare data from treeview
-        data = []
-        for row in treeview.get_children():
-            values = treeview.item(row)["values"]
-            data.append(values)
+        return _write_atomically(filename, write)
+    finally:
+        _close(rows)
+
+def export_payroll_summary_xlsx(period, filename, progress=None):
+    """Stream one period's payroll summary from the database straight to an .xlsx file."""
+    return write_xlsx(iter_payroll_summary_by_period(period), filename, progress=progress,
+                      sheet_title="Payroll Report")
+
+def _money(value):
+    # SQLite hands back floats/ints where MySQL returns Decimal
+    return value if value is None or isinstance(value, Decimal) else Decimal(str(value)).quantize(Decimal("0.01"))
+
+def _date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def _arrow_columns(columns):
+    """Return (pyarrow module, schema, per-column converters) for a columnar export."""
+    try:
+        # pyarrow is optional and only needed for these exports
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow export needs the pyarrow package (pip install pyarrow)") from None
+
+    types = {
+        "string": (pa.string(), None),
+        "int": (pa.int64(), None),
+        "money": (pa.decimal128(12, 2), _money),
+        "date": (pa.date32(), _date),
+    }
+    schema = pa.schema([(name, types[kind][0]) for name, kind in columns])
+    return pa, schema, [types[kind][1] for _, kind in columns]
+
+def write_columnar(rows, filename, columns, progress=None, row_group_size=ROW_GROUP_SIZE):
+    """
+    Write rows to a Parquet file, or an Arrow IPC file when filename ends in .arrow,
+    .feather or .ipc, one row group / record batch of row_group_size rows at a time.
+    Both are zstd-compressed and typed, so readers load them without parsing.
+    """
+    pa, schema, converters = _arrow_columns(columns)
+    ipc = os.path.splitext(filename)[1].lower() in (".arrow", ".feather", ".ipc")
+
+    def open_writer(path):
+        if ipc:
+            return pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression="zstd")
+
+    def write(path):
+        written = 0
+        with open_writer(path) as writer:
+            for batch in _batches(rows, row_group_size):
+                arrays = []
+                for values, convert, field in zip(zip(*batch), converters, schema):
+                    if convert:
+                        values = [convert(value) for value in values]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+                written += len(batch)
+                if progress:
+                    progress(written)
+        return written
+
+    try:
+        return _write_atomically(filename, write)
+    finally:
+        _close(rows)
+
+def export_payroll_summary_columnar(period, filename, progress=None):
+    """Stream one period's payroll summary from the database to Parquet / Arrow IPC."""
+    return write_columnar(iter_payroll_summary_by_period(period), filename, PAYROLL_SUMMARY_COLUMNS, progress)
+
+def export_attendance_columnar(filename, date_from=None, date_to=None, progress=None):
+    """Stream attendance history (optionally limited to [date_from, date_to]) to Parquet / Arrow IPC."""
+    return write_columnar(iter_attendance(date_from, date_to), filename, ATTENDANCE_COLUMNS, progress)
 
-        # Convert the data to a pandas DataFrame
-        df = pd.DataFrame(data, columns=["Employee Name", "Base Salary", "Bonus", "Deductions", "Net Pay"])
+def payroll_range_header(report, by_department=False):
+    return ["Department" if by_department else "Employee Name", *report["periods"], "Total"]
 
-        # Save to Excel
-        df.to_excel(filename, index=False)
+def export_payroll_range(filename, period_from, period_to, by_department=False, progress=None):
+    """
+    Export the period x employee (or department) net pay pivot of get_payroll_range_report,
+    as CSV, Excel, Parquet or Arrow IPC depending on the file extension.
+    """
+    report = get_payroll_range_report(period_from, period_to, by_department)
+    if report is None:
+        raise RuntimeError("Failed to load the payroll report")
 
-        messagebox.showinfo("Success", f"Report successfully exported to {filename}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to export report:\n{e}")
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return write_csv(report["rows"], filename, payroll_range_header(report, by_department), progress)
+    if extension == ".xlsx":
+        return write_xlsx(report["rows"], filename, payroll_range_header(report, by_department), progress,
+                          sheet_title="Payroll Report")
+    columns = [("department" if by_department else "employee_name", "string")]
+    columns += [(period, "money") for period in report["periods"]] + [("total", "money")]
+    return write_columnar(report["rows"], filename, columns, progress)
@@ -0,0 +1,78 @@
+"""
+Cold-start import budget for the login window.
+
+Imports what app/main.py needs before the login screen appears in a fresh
+interpreter under `-X importtime`, prints the slowest modules, and exits with
+status 1 when the total is over budget or a module that only a feature view
+needs (matplotlib, pandas, ...) was pulled in at startup.
+
+    python -m app.utils.startup_budget [--budget-ms 800] [--top 15] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Everything imported before the login window is shown (see app/main.py)
+STARTUP_MODULES = ("ttkbootstrap", "app.views.login_view", "app.views.register_view")
+BUDGET_MS = float(os.environ.get("EMPLOYEE_STARTUP_BUDGET_MS", "800"))
+# Only needed once a feature view is opened; importing one of these at startup is a regression
+DEFERRED_MODULES = ("matplotlib", "pandas", "numpy", "openpyxl", "pyarrow", "app.views.dashboard_view")
+
+
+def measure(modules=STARTUP_MODULES):
+    """Return [(module, self_us, cumulative_us, depth)] in the order the interpreter reported them."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"interpreter exited with {result.returncode}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        # Nesting is shown as two spaces per level after the separator's own space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(STARTUP_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    try:
+        imports = measure(args.modules)
+    except RuntimeError as e:
+        print(f"[ERROR] import failed: {e}")
+        return 2
+
+    total_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(imports, key=lambda i: i[2], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}")
+    print(f"\n{len(imports)} modules, {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    names = {name for name, _, _, _ in imports}
+    deferred = sorted(m for m in DEFERRED_MODULES if m in names)
+    if deferred:
+        print(f"[ERROR] imported at startup but only needed later: {', '.join(deferred)}")
+    if total_ms > args.budget_ms:
+        print(f"[ERROR] startup imports over budget by {total_ms - args.budget_ms:.1f} ms")
+    return 1 if deferred or total_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,16 @@ from tkinter import ttk
 from ttkbootstrap import Style
 from ttkbootstrap.tooltip import ToolTip
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from matplotlib.figure import Figure
 
-from app.config import create_connection
+from app.config import get_dashboard_stats
+from app.utils.background import run_in_background
+from app.views.loading import LoadingIndicator
 
 
 class OverviewPage(ttk.Frame):
+    data_tags = ("employees", "attendance", "payroll", "departments")
+
     def __init__(self, parent, style: Style, show_feature_callback):
         super().__init__(parent)
         self.style = style
@@ -40,26 +43,38 @@ class OverviewPage(ttk.Frame):
         for i in range(4):
             card_frame.columnconfigure(i, weight=1)
 
+        # Values are filled in by show_stats() once the background query returns
         stats = [
-            ("Total Employees", self.get_employee_count(), "👥", "Total number of employees", "Employee Data"),
-            ("Attendance Today", self.get_attendance_count(), "📅", "Number of employees present today", "Attendance"),
-            ("Total Payrolls", self.get_payroll_count(), "💰", "Payroll records processed", "Payroll"),
-            ("Departments", self.get_department_count(), "🏢", "Active departments in company", "Departments"),
+            ("employees", "Total Employees", "👥", "Total number of employees", "Employee Data"),
+            ("attendance_today", "Attendance Today", "📅", "Number of employees present today", "Attendance"),
+            ("payrolls", "Total Payrolls", "💰", "Payroll records processed", "Payroll"),
+            ("departments", "Departments", "🏢", "Active departments in company", "Departments"),
         ]
 
-        for idx, (title, value, icon, tooltip_text, feature_name) in enumerate(stats):
-            self.create_card(card_frame, title, value, icon, tooltip_text, column=idx, feature_name=feature_name)
+        self.card_values = {}
+        for idx, (key, title, icon, tooltip_text, feature_name) in enumerate(stats):
+            self.card_values[key] = self.create_card(
+                card_frame, title, "…", icon, tooltip_text, column=idx, feature_name=feature_name
+            )
 
         # === Charts Section ===
         chart_container = ttk.Frame(self, style="whiteframe.TFrame")
         chart_container.grid(row=3, column=0, sticky="nsew", pady=(20, 5))
         chart_container.columnconfigure(0, weight=1)
 
-        attendance_frame = ttk.LabelFrame(
+        self.attendance_frame = ttk.LabelFrame(
             chart_container, text="📈 Attendance Summary (Last 7 Days)", padding=(10, 10)
         )
-        attendance_frame.grid(row=0, column=0, sticky="nsew")
-        self.build_attendance_chart(attendance_frame)
+        self.attendance_frame.grid(row=0, column=0, sticky="nsew")
+        self.loading = LoadingIndicator(self.attendance_frame)
+
+        # One figure/canvas for the life of the page; later loads only update the bars
+        self.figure = None
+        self.canvas = None
+        self.bars = None
+        self.bar_labels = None
+        self.chart_data = None
+        self.bind("<Destroy>", self.on_destroy, add="+")
 
         # === Footer / Notes ===
         footer = ttk.Label(
@@ -71,6 +86,36 @@ class OverviewPage(ttk.Frame):
         )
         footer.grid(row=4, column=0, sticky="w", pady=(15, 0))
 
+        self.load_stats()
+
+    def load_stats(self):
+        self.loading.show()
+        run_in_background(self, self.fetch_stats, on_done=self.show_stats, on_error=self.on_stats_error)
+
+    def refresh(self):
+        self.load_stats()
+
+    def fetch_stats(self):
+        # Runs on a worker thread: database only, no Tk calls
+        stats = get_dashboard_stats()
+        if stats is None:
+            raise ConnectionError("database unavailable")
+        return stats
+
+    def show_stats(self, stats):
+        self.loading.hide()
+        for key, label in self.card_values.items():
+            label.configure(text=str(stats[key]))
+        days = [day.strftime("%m-%d") for day, _ in stats["attendance_by_day"]]
+        counts = [count for _, count in stats["attendance_by_day"]]
+        self.show_attendance_chart(days, counts)
+
+    def on_stats_error(self, error):
+        self.loading.hide()
+        print(f"[ERROR] Failed to load dashboard stats: {error}")
+        for label in self.card_values.values():
+            label.configure(text="–")
+
     def create_card(self, parent, title, value, icon_emoji, tooltip_text, column, feature_name):
         # Card container with padding and style
         card = ttk.Frame(parent, style="secondary.TFrame", padding=15)
@@ -110,11 +155,33 @@ class OverviewPage(ttk.Frame):
         if self.show_feature_callback and feature_name:
             card.bind("<Button-1>", lambda event, fn=feature_name: self.show_feature_callback(fn))
 
-    def build_attendance_chart(self, parent):
-        days, counts = self.get_attendance_last_7_days()
-
-        fig, ax = plt.subplots(figsize=(7, 4), dpi=100)
-        bars = ax.bar(days, counts, color="#b79cb9", edgecolor="#5e548e", linewidth=1.5)
+        return value_label
+
+    def show_attendance_chart(self, days, counts):
+        data = (tuple(days), tuple(counts))
+        if data == self.chart_data:
+            return  # Nothing changed since the last load: keep the rendered chart
+        if self.figure is None or len(days) != len(self.bars):
+            self.build_attendance_chart(self.attendance_frame, days, counts)
+        else:
+            self.update_attendance_chart(days, counts)
+        self.chart_data = data
+
+    def build_attendance_chart(self, parent, days, counts):
+        if self.figure is None:
+            # matplotlib.figure.Figure rather than pyplot: pyplot keeps every figure alive
+            # in its global registry until plt.close(), which this page never called
+            self.figure = Figure(figsize=(7, 4), dpi=100)
+            self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        else:
+            self.figure.clear()
+
+        ax = self.figure.add_subplot()
+        positions = range(len(days))
+        self.bars = ax.bar(positions, counts, color="#b79cb9", edgecolor="#5e548e", linewidth=1.5)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(days)
 
         ax.set_ylabel("Count", fontsize=11, fontweight="bold")
         ax.set_xlabel("Date", fontsize=11, fontweight="bold")
@@ -122,10 +189,11 @@ class OverviewPage(ttk.Frame):
         ax.set_ylim(0, max(counts + [1]) + 3)
         ax.grid(axis="y", linestyle="--", alpha=0.5)
 
-        for bar in bars:
+        self.bar_labels = []
+        for bar in self.bars:
             height = bar.get_height()
-            ax.annotate(
-                f"{height}",
+            self.bar_labels.append(ax.annotate(
+                f"{height:g}",
                 xy=(bar.get_x() + bar.get_width() / 2, height),
                 xytext=(0, 5),  # offset
                 textcoords="offset points",
@@ -134,61 +202,25 @@ class OverviewPage(ttk.Frame):
                 fontsize=9,
                 color="#5e548e",
                 fontweight="bold",
-            )
-
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    # ==== Database Queries ====
-
-    def fetch_count(self, query):
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute(query)
-        count = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
-        return count
-
-    def get_employee_count(self):
-        return self.fetch_count("SELECT COUNT(*) FROM employees")
-
-    def get_attendance_count(self):
-        return self.fetch_count("SELECT COUNT(*) FROM attendance WHERE DATE(date) = CURDATE()")
-
-    def get_payroll_count(self):
-        return self.fetch_count("SELECT COUNT(*) FROM payroll")
-
-    def get_department_count(self):
-        return self.fetch_count("SELECT COUNT(*) FROM departments")
-
-    def get_attendance_last_7_days(self):
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        base = datetime.today()
-        date_list = [(base - timedelta(days=x)).date() for x in range(6, -1, -1)]
-        counts_dict = {d: 0 for d in date_list}
-
-        cursor.execute(
-            """
-            SELECT DATE(date), COUNT(*) 
-            FROM attendance 
-            WHERE date >= CURDATE() - INTERVAL 6 DAY 
-            GROUP BY DATE(date)
-            ORDER BY DATE(date)
-            """
-        )
-        rows = cursor.fetchall()
-
-        for row in rows:
-            counts_dict[row[0]] = row[1]
-
-        cursor.close()
-        conn.close()
-
-        counts = [counts_dict[d] for d in date_list]
-        date_str_list = [d.strftime("%m-%d") for d in date_list]
-        return date_str_list, counts
+            ))
+
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def update_attendance_chart(self, days, counts):
+        # Same number of bars: move heights/labels in place instead of rebuilding the axes
+        ax = self.bars[0].axes
+        for bar, label, count in zip(self.bars, self.bar_labels, counts):
+            bar.set_height(count)
+            label.set_text(f"{count:g}")
+            label.xy = (bar.get_x() + bar.get_width() / 2, count)
+        ax.set_xticklabels(days)
+        ax.set_ylim(0, max(counts + [1]) + 3)
+        self.canvas.draw_idle()
+
+    def on_destroy(self, event):
+        if event.widget is not self or self.figure is None:
+            return
+        # Drop the Agg buffers and artists now instead of waiting on the garbage collector
+        self.figure.clear()
+        self.figure = self.canvas = self.bars = self.bar_labels = self.chart_data = None
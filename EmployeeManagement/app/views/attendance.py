@@ -1,16 +1,23 @@
-from ttkbootstrap import Frame, Label, Entry, Combobox, Button, Scrollbar, Treeview
+from tkinter import filedialog, messagebox
+from ttkbootstrap import Frame, Label, Entry, Combobox, Button
 from ttkbootstrap.constants import *
 from datetime import datetime
 
 from ..config import (
     add_attendance,
-    get_all_attendance,
+    count_attendance,
+    get_attendance_window,
     delete_attendance_by_id,
     get_all_employee_names
 )
+from ..utils.attendance_importer import import_attendance
+from ..utils.background import call_on_ui, run_in_background
+from .virtual_table import QuerySource, VirtualTable
 
 
 class AttendanceView(Frame):
+    data_tags = ("attendance", "employees")
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         self.master = master
@@ -59,56 +66,47 @@ class AttendanceView(Frame):
         Button(btn_frame, text="Delete Selected", bootstyle="danger", command=self.delete_selected)\
             .pack(side="left", padx=5)
 
-        # === Table ===
-        table_frame = Frame(self)
-        table_frame.pack(fill="both", expand=True)
-
-        vsb = Scrollbar(table_frame, orient="vertical")
-        vsb.pack(side="right", fill="y")
-
-        hsb = Scrollbar(table_frame, orient="horizontal")
-        hsb.pack(side="bottom", fill="x")
-
-        self.tree = Treeview(
-            table_frame,
-            columns=("Date", "Employee Name", "Status", "Check-in", "Check-out", "Notes"),
-            show="headings",
-            yscrollcommand=vsb.set,
-            xscrollcommand=hsb.set,
-            height=15
-        )
-        self.tree.pack(fill="both", expand=True)
-        vsb.config(command=self.tree.yview)
-        hsb.config(command=self.tree.xview)
-
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor="center", width=120)
-
-        self.tree.column("Notes", width=200, anchor="w")
+        self.btn_import = Button(btn_frame, text="Import CSV", bootstyle="info", command=self.import_csv)
+        self.btn_import.pack(side="left", padx=5)
+        self.import_status = Label(btn_frame, text="", bootstyle="secondary")
+        self.import_status.pack(side="left", padx=10)
+        self.importing = False
 
-        self.tree.tag_configure('oddrow', background='#d0ebff')
-        self.tree.tag_configure('evenrow', background='white')
+        # === Table ===
+        source = QuerySource(count_attendance, get_attendance_window,
+                             sort_keys=["date"])  # indexed columns only (ATTENDANCE_SORTS)
+        self.table = VirtualTable(self, source, [
+            ("Date", 120, "center"),
+            ("Employee Name", 120, "center"),
+            ("Status", 120, "center"),
+            ("Check-in", 120, "center"),
+            ("Check-out", 120, "center"),
+            ("Notes", 200, "w"),
+        ], render_row=self.render_record)
+        self.table.pack(fill="both", expand=True)
 
     def populate_employee_names(self):
-        names = get_all_employee_names()
+        run_in_background(self, get_all_employee_names, on_done=self.set_employee_names)
+
+    def set_employee_names(self, names):
         self.name_combo['values'] = names
 
     def load_attendance(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        records = get_all_attendance()
-        for index, record in enumerate(records):
-            tag = 'oddrow' if index % 2 == 0 else 'evenrow'
-            self.tree.insert("", "end", values=(
-                record[6],  # date
-                record[1],  # employee_name
-                record[2],  # status
-                record[3],  # checkin
-                record[4],  # checkout
-                record[5],  # notes
-            ), tags=(tag,))
+        self.table.reload()
+
+    def refresh(self):
+        self.populate_employee_names()
+        self.load_attendance()
+
+    def render_record(self, record):
+        return (
+            record[6],  # date
+            record[1],  # employee_name
+            record[2],  # status
+            record[3],  # checkin
+            record[4],  # checkout
+            record[5],  # notes
+        )
 
     def add_attendance(self):
         name = self.name_combo.get()
@@ -125,23 +123,68 @@ class AttendanceView(Frame):
                 self.clear_form()
 
     def edit_selected(self):
-        selected = self.tree.selection()
+        selected = self.table.selected_rows()
         if selected:
-            values = self.tree.item(selected[0])["values"]
+            values = self.render_record(selected[0])
             self.name_combo.set(values[1])
             self.status_combo.set(values[2])
             self.checkin_entry.delete(0, "end")
-            self.checkin_entry.insert(0, values[3])
+            self.checkin_entry.insert(0, values[3] or "")
             self.checkout_entry.delete(0, "end")
-            self.checkout_entry.insert(0, values[4])
+            self.checkout_entry.insert(0, values[4] or "")
             self.notes_entry.delete(0, "end")
-            self.notes_entry.insert(0, values[5])
-            self.tree.delete(selected[0])
+            self.notes_entry.insert(0, values[5] or "")
 
     def delete_selected(self):
-        selected = self.tree.selection()
-        for item in selected:
-            self.tree.delete(item)
+        selected = self.table.selected_rows()
+        if not selected:
+            messagebox.showwarning("No selection", "Please select an attendance record to delete.")
+            return
+        # Rows on screen are a window onto the database, so removing one means deleting it
+        confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this attendance record?")
+        if confirm:
+            att_id = selected[0][0]
+            if delete_attendance_by_id(att_id):
+                self.table.remove_row(att_id)
+            else:
+                messagebox.showerror("Error", "Failed to delete attendance record.")
+
+    def import_csv(self):
+        path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+        if not path:
+            return
+
+        # Parsing and the batched inserts run on a worker; progress is posted back to the Tk thread
+        self.set_importing(True)
+        run_in_background(
+            self, import_attendance, path,
+            progress=lambda *counts: call_on_ui(self, self.on_import_progress, *counts),
+            on_done=self.on_import_done, on_error=self.on_import_failed
+        )
+
+    def set_importing(self, importing):
+        self.importing = importing
+        self.btn_import.configure(state="disabled" if importing else "normal")
+        self.import_status.configure(text="Importing..." if importing else "")
+
+    def on_import_progress(self, rows_read, imported, rejected):
+        if self.importing:  # ignore updates that arrive after the import ended
+            self.import_status.configure(text=f"Importing... {rows_read:,} rows read, {rejected:,} rejected")
+
+    def on_import_done(self, result):
+        self.set_importing(False)
+        self.load_attendance()
+        message = f"{result.imported:,} of {result.rows:,} rows imported."
+        if result.rejected_file:
+            message += f"\n{result.rejected:,} rejected rows were written to {result.rejected_file}"
+            messagebox.showwarning("Import Finished", message)
+        else:
+            messagebox.showinfo("Import Finished", message)
+
+    def on_import_failed(self, error):
+        self.set_importing(False)
+        self.load_attendance()  # batches written before the failure are kept
+        messagebox.showerror("Error", f"Failed to import attendance:\n{error}")
 
     def clear_form(self):
         self.name_combo.set("")
@@ -1,16 +1,30 @@
 import os
+from collections import OrderedDict
+from tkinter import ttk
 from PIL import Image, ImageTk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
-from app.views.Overview import OverviewPage
-# Import all views
-from app.views.employee import EmployeeView
-from app.views.department import DepartmentView
-from app.views.attendance import AttendanceView
-from app.views.payroll import PayrollView
-from app.views.report import ReportView
-from app.views.settings import SettingsView
+from app.config.cache import cache
+
+# Feature views are imported in show_feature() the first time they are opened:
+# Overview pulls in matplotlib, which the dashboard shell doesn't need
+
+# Views that have been opened stay alive (hidden) so switching back is instant. The least
+# recently used ones are destroyed once more than MAX_CACHED_VIEWS are kept or their
+# combined size (widgets + table rows, see view_footprint) goes over VIEW_CACHE_BUDGET.
+MAX_CACHED_VIEWS = 5
+VIEW_CACHE_BUDGET = 20000
+
+
+def view_footprint(widget):
+    """Rough memory weight of a view: one per widget plus one per Treeview row."""
+    size = 1
+    if isinstance(widget, ttk.Treeview):
+        size += len(widget.get_children())
+    for child in widget.winfo_children():
+        size += view_footprint(child)
+    return size
 
 
 class DashboardView(tb.Frame):
@@ -21,7 +35,9 @@ class DashboardView(tb.Frame):
         self.style = tb.Style()
         self.default_theme = self.style.theme.name
         self.pack(fill="both", expand=True)
-        self.views = {}
+        self.views = OrderedDict()  # key -> built view, least recently shown first
+        self.view_versions = {}  # key -> cache tag versions when the view was last hidden
+        self.current_key = None
         self.build_ui()
 
 
@@ -89,8 +105,7 @@ class DashboardView(tb.Frame):
         self.show_dashboard_home()  # Initial welcome screen
 
     def show_dashboard_home(self):
-        for widget in self.content.winfo_children():
-            widget.destroy()
+        self.clear_content()
 
         tb.Label(
             self.content,
@@ -105,22 +120,28 @@ class DashboardView(tb.Frame):
         ).grid(row=1, column=0, sticky="w")
 
     def show_feature(self, feature_name):
-        for widget in self.content.winfo_children():
-            widget.destroy()
+        self.clear_content()
 
         if feature_name == "Dashboard Overview":
+            from app.views.Overview import OverviewPage
             self.load_view("overview", lambda parent: OverviewPage(parent, self.style, self.show_feature))
         elif feature_name == "Employee Data":
+            from app.views.employee import EmployeeView
             self.load_view("employee", EmployeeView)
         elif feature_name == "Departments":
+            from app.views.department import DepartmentView
             self.load_view("department", DepartmentView)
         elif feature_name == "Attendance":
+            from app.views.attendance import AttendanceView
             self.load_view("attendance", AttendanceView)
         elif feature_name == "Payroll":
+            from app.views.payroll import PayrollView
             self.load_view("payroll", PayrollView)
         elif feature_name == "Report":
+            from app.views.report import ReportView
             self.load_view("report", ReportView)
         elif feature_name == "Setting":
+            from app.views.settings import SettingsView
             self.load_view("settings", lambda parent: SettingsView(parent, self.style, self.default_theme, self.username, lambda: self.master.show_login()))
 
         else:
@@ -135,11 +156,41 @@ class DashboardView(tb.Frame):
                 font=("Segoe UI", 12)
             ).grid(row=1, column=0, sticky="w")
 
-    def load_view(self, key, view_class):
-        if key in self.views:
-            self.views[key].destroy()
+    def clear_content(self):
+        # Hide the cached view on screen; anything else (welcome/placeholder labels) is throwaway
+        if self.current_key is not None:
+            view = self.views[self.current_key]
+            self.view_versions[self.current_key] = self.data_versions(view)
+            view.pack_forget()
+            self.current_key = None
+        cached = set(self.views.values())
+        for widget in self.content.winfo_children():
+            if widget not in cached:
+                widget.destroy()
 
-        view = view_class(self.content) if callable(view_class) else view_class(self.content)
+    def data_versions(self, view):
+        return tuple(cache.version(tag) for tag in getattr(view, "data_tags", ()))
 
-        view.pack(fill="both", expand=True)
+    def load_view(self, key, view_class):
+        view = self.views.pop(key, None)
+        if view is None:
+            view = view_class(self.content)
+        elif self.data_versions(view) != self.view_versions.get(key):
+            # Data it shows was written elsewhere while it was hidden
+            view.refresh()
         self.views[key] = view
+        self.current_key = key
+
+        view.pack(fill="both", expand=True)
+        self.evict_views()
+
+    def evict_views(self):
+        footprints = {key: view_footprint(view) for key, view in self.views.items()}
+        for key in list(self.views):
+            if len(self.views) <= MAX_CACHED_VIEWS and sum(footprints.values()) <= VIEW_CACHE_BUDGET:
+                break
+            if key == self.current_key:
+                continue
+            self.views.pop(key).destroy()
+            self.view_versions.pop(key, None)
+            del footprints[key]
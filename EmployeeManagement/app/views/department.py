@@ -4,9 +4,12 @@ from app.config import get_all_departments, add_department, update_department, d
 from tkinter import messagebox
 
 from app.views.department_form import DepartmentForm
+from app.views.virtual_table import ListSource, VirtualTable
 
 
 class DepartmentView(tb.Frame):
+    data_tags = ("departments",)
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         self.master = master
@@ -17,40 +20,12 @@ class DepartmentView(tb.Frame):
         title = tb.Label(self, text="Department Management", font=("Segoe UI", 16, "bold"))
         title.pack(anchor="w", pady=(0, 10))
 
-        table_frame = tb.Frame(self)
-        table_frame.pack(fill="both", expand=True)
-
-        vsb = tb.Scrollbar(table_frame, orient="vertical")
-        vsb.pack(side="right", fill="y")
-
-        hsb = tb.Scrollbar(table_frame, orient="horizontal")
-        hsb.pack(side="bottom", fill="x")
-
-        self.tree = tb.Treeview(
-            table_frame,
-            columns=("ID", "Department Name", "Manager"),
-            show="headings",
-            yscrollcommand=vsb.set,
-            xscrollcommand=hsb.set,
-            height=15,
-            style="success.Treeview"
-        )
-        self.tree.pack(fill="both", expand=True)
-
-        vsb.config(command=self.tree.yview)
-        hsb.config(command=self.tree.xview)
-
-        self.tree.heading("ID", text="ID")
-        self.tree.column("ID", width=50, anchor="center")
-
-        self.tree.heading("Department Name", text="Department Name")
-        self.tree.column("Department Name", width=200, anchor="w")
-
-        self.tree.heading("Manager", text="Manager")
-        self.tree.column("Manager", width=150, anchor="w")
-
-        self.tree.tag_configure('oddrow', background='#e9e7fd')  # light purple
-        self.tree.tag_configure('evenrow', background='white')
+        self.table = VirtualTable(self, ListSource(), [
+            ("ID", 50, "center"),
+            ("Department Name", 200, "w"),
+            ("Manager", 150, "w"),
+        ], style="success.Treeview", stripes=('#e9e7fd', 'white'))  # light purple
+        self.table.pack(fill="both", expand=True)
 
         btn_frame = tb.Frame(self)
         btn_frame.pack(fill="x", pady=(10, 0))
@@ -65,35 +40,33 @@ class DepartmentView(tb.Frame):
         btn_delete.pack(side="left", padx=5)
 
     def load_departments(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        self.table.source = ListSource(get_all_departments(), sort_keys=[
+            lambda d: d[0], lambda d: (d[1] or "").lower(), lambda d: (d[2] or "").lower(),
+        ])
+        self.table.reload()
 
-        departments = get_all_departments()
-        for index, dept in enumerate(departments):
-            tag = 'oddrow' if index % 2 == 0 else 'evenrow'
-            self.tree.insert("", "end", values=dept, tags=(tag,))
+    def refresh(self):
+        self.load_departments()
 
     def add_department(self):
         DepartmentForm(self.master, self, "Add Department")
 
     def edit_department(self):
-        selected = self.tree.selection()
+        selected = self.table.selected_rows()
         if not selected:
             messagebox.showwarning("Warning", "Please select a department to edit.")
             return
 
-        item = self.tree.item(selected[0])
-        dep_id, department_name, manager = item['values']
+        dep_id, department_name, manager = selected[0]
         DepartmentForm(self.master, self, "Edit Department", dep_id, department_name, manager)
 
     def delete_department(self):
-        selected = self.tree.selection()
+        selected = self.table.selected_rows()
         if not selected:
             messagebox.showwarning("Warning", "Please select a department to delete.")
             return
 
-        item = self.tree.item(selected[0])
-        dep_id = item['values'][0]
+        dep_id = selected[0][0]
 
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this department?"):
             if delete_department(dep_id):
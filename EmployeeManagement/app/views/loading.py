@@ -0,0 +1,29 @@
+import ttkbootstrap as tb
+
+
+class LoadingIndicator(tb.Frame):
+    """
+    "Loading…" badge with an indeterminate progress bar, placed over the centre of
+    its parent while background work is running. Nested show()/hide() calls are
+    counted, so overlapping loads keep it visible until the last one finishes.
+    """
+
+    def __init__(self, master, text="Loading…"):
+        super().__init__(master, padding=10, bootstyle="light")
+        tb.Label(self, text=text, font=("Segoe UI", 10, "italic"), bootstyle="secondary").pack()
+        self.bar = tb.Progressbar(self, mode="indeterminate", length=160, bootstyle="info-striped")
+        self.bar.pack(pady=(5, 0))
+        self._depth = 0
+
+    def show(self):
+        self._depth += 1
+        if self._depth == 1:
+            self.place(relx=0.5, rely=0.5, anchor="center")
+            self.lift()
+            self.bar.start(12)
+
+    def hide(self):
+        self._depth = max(0, self._depth - 1)
+        if self._depth == 0:
+            self.bar.stop()
+            self.place_forget()
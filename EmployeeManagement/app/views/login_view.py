@@ -73,7 +73,7 @@ class LoginView(tb.Frame):
         self._set_placeholder(self.password_entry, "Password", is_password=True)
         self.password_entry.grid(row=2, column=0, pady=15, ipady=10, sticky="ew")
 
-        self.feedback = tb.Label(form_container, text="", foreground="red")
+        self.feedback = tb.Label(form_container, text="", foreground="red", wraplength=320)
         self.feedback.grid(row=3, column=0, pady=(5, 15))
 
         tb.Button(form_container, text="Login", bootstyle="success", command=self.login).grid(
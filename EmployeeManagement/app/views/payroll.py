@@ -1,63 +1,39 @@
+from datetime import date
 from tkinter import messagebox
 import ttkbootstrap as tb
+from ttkbootstrap.dialogs import Querybox
 
-from app.config import get_all_payroll, create_connection, get_payroll_by_id
+from app.config import count_payroll, get_payroll_window, delete_payroll, get_payroll_by_id
+from app.utils.background import run_in_background
+from app.utils.payroll_run import parse_period, run_payroll
 from app.views.payroll_form import PayrollForm
+from app.views.virtual_table import QuerySource, VirtualTable
 
 class PayrollView(tb.Frame):
+    data_tags = ("payroll", "employees")
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         self.master = master
-        self.payroll_data = {}  # Cache payroll rows by ID
         self.build_ui()
 
     def build_ui(self):
         title = tb.Label(self, text="Payroll Management", font=("Segoe UI", 16, "bold"))
         title.pack(anchor="w", pady=(0, 10))
 
-        table_frame = tb.Frame(self)
-        table_frame.pack(fill="both", expand=True)
-
-        vsb = tb.Scrollbar(table_frame, orient="vertical")
-        vsb.pack(side="right", fill="y")
-
-        self.tree = tb.Treeview(
-            table_frame,
-            columns=("Period", "Employee Name", "Base Salary", "Bonus", "Deductions", "Net Pay", "Status"),
-            show="headings",
-            yscrollcommand=vsb.set,
-            height=15,
-            style="info.Treeview"
-        )
-        self.tree.pack(fill="both", expand=True)
-        vsb.config(command=self.tree.yview)
-
-        # Setup headings and column widths
-        self.tree.heading("Period", text="Period")
-        self.tree.column("Period", width=100, anchor="center")
-
-        self.tree.heading("Employee Name", text="Employee Name")
-        self.tree.column("Employee Name", width=180, anchor="w")
-
-        self.tree.heading("Base Salary", text="Base Salary")
-        self.tree.column("Base Salary", width=100, anchor="e")
-
-        self.tree.heading("Bonus", text="Bonus")
-        self.tree.column("Bonus", width=80, anchor="e")
-
-        self.tree.heading("Deductions", text="Deductions")
-        self.tree.column("Deductions", width=100, anchor="e")
-
-        self.tree.heading("Net Pay", text="Net Pay")
-        self.tree.column("Net Pay", width=100, anchor="e")
-
-        self.tree.heading("Status", text="Status")
-        self.tree.column("Status", width=100, anchor="center")
-
-        # Configure row tags for colors
-        self.tree.tag_configure('oddrow', background='#f0e9f5')  # light purple
-        self.tree.tag_configure('evenrow', background='white')
-
+        # Only indexed columns sort server-side (see PAYROLL_SORTS)
+        source = QuerySource(count_payroll, get_payroll_window, sort_keys=["period"])
+        self.table = VirtualTable(self, source, [
+            ("Period", 100, "center"),
+            ("Employee Name", 180, "w"),
+            ("Base Salary", 100, "e"),
+            ("Bonus", 80, "e"),
+            ("Deductions", 100, "e"),
+            ("Net Pay", 100, "e"),
+            ("Status", 100, "center"),
+        ], render_row=self.render_row, style="info.Treeview",
+            stripes=('white', '#f0e9f5'))  # light purple on every second row
+        self.table.pack(fill="both", expand=True)
         self.refresh_table()
 
         btn_frame = tb.Frame(self)
@@ -72,50 +48,45 @@ class PayrollView(tb.Frame):
         btn_delete = tb.Button(btn_frame, text="Delete Selected", bootstyle="danger", command=self.on_delete_payroll)
         btn_delete.pack(side="left", padx=5)
 
-    def refresh_table(self):
-        # Clear existing rows
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        rows = get_all_payroll()
-        self.payroll_data.clear()
-
-        for i, row in enumerate(rows):
-            # row: id, employee name, period, base_salary, bonus, deductions, net_pay, status
-            self.payroll_data[row[0]] = row
+        self.btn_run = tb.Button(btn_frame, text="Run Payroll", bootstyle="success", command=self.on_run_payroll)
+        self.btn_run.pack(side="right", padx=5)
 
-            try:
-                net_pay_val = float(row[6]) if row[6] else 0.0
-            except (ValueError, TypeError):
-                net_pay_val = 0.0
-
-            net_pay_str = f"${net_pay_val:,.2f}"
-
-            values = (
-                row[1],  # Period
-                row[2],  # Employee Name
-                f"${float(row[3]):,.2f}",  # Base Salary
-                f"${float(row[4]):,.2f}",  # Bonus
-                f"${float(row[5]):,.2f}",  # Deductions
-                net_pay_str,
-                row[7],  # Status
-            )
+    def refresh_table(self):
+        self.table.reload()
 
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
+    def refresh(self):
+        self.refresh_table()
 
-            # Set the DB payroll ID as Treeview item id (iid)
-            self.tree.insert("", "end", iid=str(row[0]), values=values, tags=(tag,))
+    def render_row(self, row):
+        # row: id, period, employee name, base_salary, bonus, deductions, net_pay, status
+        # (the DB payroll ID becomes the Treeview item id)
+        try:
+            net_pay_val = float(row[6]) if row[6] else 0.0
+        except (ValueError, TypeError):
+            net_pay_val = 0.0
+
+        net_pay_str = f"${net_pay_val:,.2f}"
+
+        return (
+            row[1],  # Period
+            row[2],  # Employee Name
+            f"${float(row[3]):,.2f}",  # Base Salary
+            f"${float(row[4]):,.2f}",  # Bonus
+            f"${float(row[5]):,.2f}",  # Deductions
+            net_pay_str,
+            row[7],  # Status
+        )
 
     def on_add_payroll(self):
         PayrollForm(self.master, self.refresh_table)
 
     def on_edit_payroll(self):
-        selected = self.tree.selection()
+        selected = self.table.selected_rows()
         if not selected:
             messagebox.showwarning("No selection", "Please select a payroll to edit.")
             return
 
-        payroll_id = int(selected[0])
+        payroll_id = selected[0][0]
         payroll = get_payroll_by_id(payroll_id)
         if not payroll:
             messagebox.showerror("Error", "Payroll data not found for editing.")
@@ -123,26 +94,52 @@ class PayrollView(tb.Frame):
 
         PayrollForm(self.master, self.refresh_table, payroll=payroll)
 
+    def on_run_payroll(self):
+        period = Querybox.get_string(
+            prompt="Payroll period to run for all active employees (e.g. 2025-06):",
+            title="Run Payroll", initialvalue=date.today().strftime("%Y-%m"), parent=self
+        )
+        if not period or not period.strip():
+            return
+        try:
+            period = parse_period(period)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        # Whole-company run on a worker thread; rows already marked Paid are kept as they are
+        self.btn_run.configure(state="disabled")
+        self.table.loading.show()
+        run_in_background(self, run_payroll, period,
+                          on_done=self.on_payroll_run_done, on_error=self.on_payroll_run_failed)
+
+    def on_payroll_run_done(self, result):
+        self.btn_run.configure(state="normal")
+        self.table.loading.hide()
+        self.refresh_table()
+        messagebox.showinfo(
+            "Payroll Run",
+            f"Period {result.period}: {result.written} of {result.employees} active employees written "
+            f"({result.skipped} skipped: no salary or already paid).\n"
+            f"Total net pay: ${result.total_net_pay:,.2f}"
+        )
+
+    def on_payroll_run_failed(self, error):
+        self.btn_run.configure(state="normal")
+        self.table.loading.hide()
+        messagebox.showerror("Error", f"Payroll run failed:\n{error}")
+
     def on_delete_payroll(self):
-        selected = self.tree.selection()
+        selected = self.table.selected_rows()
         if not selected:
             messagebox.showwarning("No selection", "Please select a payroll to delete")
             return
-        payroll_id = int(selected[0])
+        payroll_id = selected[0][0]
 
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this payroll?"):
-            connection = create_connection()
-            if not connection:
-                messagebox.showerror("Error", "Failed to connect to database")
-                return
             try:
-                cursor = connection.cursor()
-                cursor.execute("DELETE FROM payroll WHERE id = %s", (payroll_id,))
-                connection.commit()
+                delete_payroll(payroll_id)
                 messagebox.showinfo("Success", "Payroll deleted successfully")
-                self.refresh_table()
+                self.table.remove_row(payroll_id)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete payroll:\n{e}")
-            finally:
-                cursor.close()
-                connection.close()
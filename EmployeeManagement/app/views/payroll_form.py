@@ -1,7 +1,15 @@
 import ttkbootstrap as tb
 from tkinter import messagebox
 
-from app.config.database import get_all_employees, insert_payroll, update_payroll
+from app.config.database import (
+    calculate_net_pay,
+    get_all_employees,
+    get_employees_by_id,
+    get_employee_name,
+    insert_payroll,
+    resolve_employee_id,
+    update_payroll,
+)
 
 class PayrollForm(tb.Toplevel):
     def __init__(self, master, refresh_callback, payroll=None):
@@ -70,7 +78,7 @@ class PayrollForm(tb.Toplevel):
     def on_employee_selected(self, event):
         selected_name = self.employee_var.get()
         # Employee tuple index 5 (6th column) = basic_salary according to your info
-        employee = next((e for e in self.employees if e[1] == selected_name), None)
+        employee = get_employees_by_id().get(resolve_employee_id(selected_name))
         if employee:
             base_salary = employee[5]  # index 5 for basic_salary
             self.entry_base_salary.delete(0, "end")
@@ -79,7 +87,7 @@ class PayrollForm(tb.Toplevel):
     def fill_form(self):
         _id, employee_id, period, base_salary, bonus, deductions, net_pay, status = self.payroll
         self.entry_period.insert(0, period)
-        employee_name = next((e[1] for e in self.employees if e[0] == employee_id), "")
+        employee_name = get_employee_name(employee_id) or ""
         self.employee_var.set(employee_name)
         self.entry_base_salary.insert(0, str(base_salary))
         self.entry_bonus.insert(0, str(bonus))
@@ -106,9 +114,9 @@ class PayrollForm(tb.Toplevel):
             messagebox.showerror("Error", "Salary, Bonus, and Deductions must be numbers!")
             return
 
-        net_pay = base_salary + bonus - deductions
+        net_pay = calculate_net_pay(base_salary, bonus, deductions)
 
-        employee_id = next((e[0] for e in self.employees if e[1] == employee_name), None)
+        employee_id = resolve_employee_id(employee_name)
         if employee_id is None:
             messagebox.showerror("Error", "Selected employee not found!")
             return
@@ -124,9 +132,13 @@ class PayrollForm(tb.Toplevel):
                 else:
                     messagebox.showerror("Error", "Failed to update payroll")
             else:
-                insert_payroll(employee_id, period, base_salary, bonus, deductions, net_pay, status)
-                messagebox.showinfo("Success", "Payroll saved successfully.")
-                self.refresh_callback()
-                self.destroy()
+                if insert_payroll(employee_id, period, base_salary, bonus, deductions, net_pay, status):
+                    messagebox.showinfo("Success", "Payroll saved successfully.")
+                    self.refresh_callback()
+                    self.destroy()
+                else:
+                    messagebox.showerror(
+                        "Error", "Failed to save payroll. Does this employee already have a payroll for this period?"
+                    )
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to save payroll:\n{e}")
@@ -2,11 +2,27 @@ from tkinter import filedialog, messagebox
 import ttkbootstrap as tb
 
 
-from app.config import get_payroll_summary_by_period
-from app.utils.report_exporter import export_to_excel, export_to_csv
+from app.config import get_payroll_range_report, get_payroll_report
+from app.utils.background import call_on_ui, run_in_background
+from app.utils.report_exporter import (
+    export_attendance_columnar, export_payroll_range, export_payroll_summary_columnar,
+    export_payroll_summary_csv, export_payroll_summary_xlsx
+)
+from app.views.virtual_table import ListSource, VirtualTable
+
+COLUMNAR_FILETYPES = [("Parquet Files", "*.parquet"), ("Arrow IPC Files", "*.arrow")]
+SUMMARY_COLUMNS = [
+    ("Employee Name", 180, "w"),
+    ("Base Salary", 100, "e"),
+    ("Bonus", 80, "e"),
+    ("Deductions", 100, "e"),
+    ("Net Pay", 100, "e"),
+]
 
 
 class ReportView(tb.Frame):
+    data_tags = ("payroll", "employees")
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         self.master = master
@@ -23,69 +39,185 @@ class ReportView(tb.Frame):
         self.period_var = tb.StringVar()
         self.entry_period = tb.Entry(filter_frame, textvariable=self.period_var)
         self.entry_period.pack(side="left", padx=5)
-        tb.Button(filter_frame, text="Generate", bootstyle="primary", command=self.generate_report).pack(side="left", padx=5)
+        # Optional end period / grouping turn it into a period x employee (or department) net pay report
+        tb.Label(filter_frame, text="to").pack(side="left")
+        self.period_to_var = tb.StringVar()
+        tb.Entry(filter_frame, textvariable=self.period_to_var, width=10).pack(side="left", padx=5)
+        self.by_department_var = tb.BooleanVar()
+        tb.Checkbutton(filter_frame, text="By department", variable=self.by_department_var,
+                       bootstyle="round-toggle").pack(side="left", padx=5)
+        self.btn_generate = tb.Button(filter_frame, text="Generate", bootstyle="primary", command=self.generate_report)
+        self.btn_generate.pack(side="left", padx=5)
 
         # Export buttons
         export_frame = tb.Frame(self)
         export_frame.pack(fill="x", pady=(10, 20))
-        tb.Button(export_frame, text="Export to CSV", bootstyle="info", command=self.export_csv).pack(side="left", padx=5)
-        tb.Button(export_frame, text="Export to Excel", bootstyle="info", command=self.export_excel).pack(side="left", padx=5)
+        self.export_buttons = [
+            tb.Button(export_frame, text="Export to CSV", bootstyle="info", command=self.export_csv),
+            tb.Button(export_frame, text="Export to Excel", bootstyle="info", command=self.export_excel),
+            tb.Button(export_frame, text="Export to Parquet", bootstyle="info", command=self.export_columnar),
+            tb.Button(export_frame, text="Export Attendance History", bootstyle="info-outline",
+                      command=self.export_attendance),
+        ]
+        for button in self.export_buttons:
+            button.pack(side="left", padx=5)
+        self.exporting = False
+        self.export_status = tb.Label(export_frame, text="", bootstyle="secondary")
+        self.export_status.pack(side="left", padx=10)
 
         # Table section
-        table_frame = tb.Frame(self)
-        table_frame.pack(fill="both", expand=True)
-
-        self.tree = tb.Treeview(
-            table_frame,
-            columns=("Employee Name", "Base Salary", "Bonus", "Deductions", "Net Pay"),
-            show="headings",
-            height=15,
-            style="info.Treeview"
-        )
-        self.tree.pack(fill="both", expand=True)
-
-        self.tree.heading("Employee Name", text="Employee Name")
-        self.tree.heading("Base Salary", text="Base Salary")
-        self.tree.heading("Bonus", text="Bonus")
-        self.tree.heading("Deductions", text="Deductions")
-        self.tree.heading("Net Pay", text="Net Pay")
+        self.report_rows = []
+        self.columns = SUMMARY_COLUMNS
+        self.table = VirtualTable(self, ListSource(), self.columns, render_row=self.render_row,
+                                  style="info.Treeview")
+        self.table.pack(fill="both", expand=True)
 
-        for col in ("Base Salary", "Bonus", "Deductions", "Net Pay"):
-            self.tree.column(col, anchor="e", width=100)
-        self.tree.column("Employee Name", anchor="w", width=180)
+        self.loading = self.table.loading
 
     def export_csv(self):
-        # Open file dialog to select location and filename
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
-        if filename:
-            export_to_csv(self.tree, filename)
+        self.export_report(export_payroll_summary_csv, ".csv", ("CSV Files", "*.csv"))
 
     def export_excel(self):
-        # Open file dialog to select location and filename
-        filename = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+        self.export_report(export_payroll_summary_xlsx, ".xlsx", ("Excel Files", "*.xlsx"))
+
+    def export_columnar(self):
+        self.export_report(export_payroll_summary_columnar, ".parquet", *COLUMNAR_FILETYPES)
+
+    def export_attendance(self):
+        # Whole attendance history; independent of the period filter
+        filename = filedialog.asksaveasfilename(defaultextension=".parquet", filetypes=COLUMNAR_FILETYPES)
         if filename:
-            export_to_excel(self.tree, filename)
+            self.start_export(filename, export_attendance_columnar, filename)
 
-    def generate_report(self):
+    def export_report(self, export, extension, *filetypes):
+        request = self.read_report_request()
+        if not request:
+            return
+        period, report_range = request
+
+        # Open file dialog to select location and filename
+        filename = filedialog.asksaveasfilename(defaultextension=extension, filetypes=list(filetypes))
+        if not filename:
+            return
+        if report_range:
+            # Range reports go through one exporter that picks the format from the extension
+            self.start_export(filename, export_payroll_range, filename, *report_range)
+        else:
+            self.start_export(filename, export, period, filename)
+
+    def start_export(self, filename, export, *args):
+        # Rows stream from the database to the file on a worker thread, independent of the table
+        self.set_exporting(True)
+        run_in_background(
+            self, export, *args,
+            progress=lambda written: call_on_ui(self, self.on_export_progress, written),
+            on_done=lambda written: self.on_export_done(filename, written),
+            on_error=self.on_export_failed
+        )
+
+    def set_exporting(self, exporting):
+        self.exporting = exporting
+        for button in self.export_buttons:
+            button.configure(state="disabled" if exporting else "normal")
+        self.export_status.configure(text="Exporting..." if exporting else "")
+
+    def on_export_progress(self, written):
+        if self.exporting:  # ignore updates that arrive after the export ended
+            self.export_status.configure(text=f"Exporting... {written:,} rows")
+
+    def on_export_done(self, filename, written):
+        self.set_exporting(False)
+        messagebox.showinfo("Success", f"{written:,} rows exported to {filename}")
+
+    def on_export_failed(self, error):
+        self.set_exporting(False)
+        messagebox.showerror("Error", f"Failed to export report:\n{error}")
+
+    def read_report_request(self):
+        """
+        Return (period, report_range) from the filters, report_range being (period_from,
+        period_to, by_department) for a range report and None for a single period.
+        Warns and returns None when the filters are incomplete.
+        """
         period = self.period_var.get().strip()
         if not period:
             messagebox.showwarning("Input Error", "Please enter a payroll period (e.g. 2025-06)")
-            return
+            return None
+
+        period_to = self.period_to_var.get().strip()
+        by_department = self.by_department_var.get()
+        if not period_to and not by_department:
+            return period, None
+        period_to = period_to or period
+        if period_to < period:
+            messagebox.showwarning("Input Error", "The end period must not be before the start period")
+            return None
+        return period, (period, period_to, by_department)
 
-        # Generate the report using ReportController
-        # Use your `ReportController` class to get results and update table
-        results = get_payroll_summary_by_period(period)
+    def generate_report(self):
+        request = self.read_report_request()
+        if not request:
+            return
+        period, report_range = request
+
+        # Query on a worker thread; the table is filled back on the Tk thread
+        self.btn_generate.configure(state="disabled")
+        self.loading.show()
+        if report_range:
+            run_in_background(
+                self, get_payroll_range_report, *report_range,
+                on_done=lambda report: self.on_range_report_loaded(report, report_range[2]),
+                on_error=self.on_report_failed
+            )
+        else:
+            run_in_background(
+                self, get_payroll_report, period,
+                on_done=self.on_report_loaded, on_error=self.on_report_failed
+            )
+
+    def refresh(self):
+        # Only re-run a report that is already on screen
+        if self.report_rows and self.period_var.get().strip():
+            self.generate_report()
+
+    def on_report_loaded(self, results):
+        self.btn_generate.configure(state="normal")
+        self.loading.hide()
         self.update_report_table(results)
 
+    def on_range_report_loaded(self, report, by_department):
+        if report is None:
+            self.on_report_failed("Could not read payroll data")
+            return
+        self.btn_generate.configure(state="normal")
+        self.loading.hide()
+        self.update_range_table(report, by_department)
+
+    def on_report_failed(self, error):
+        self.btn_generate.configure(state="normal")
+        self.loading.hide()
+        messagebox.showerror("Error", f"Failed to generate report:\n{error}")
+
     def update_report_table(self, results):
-        # Update the table with the fetched results
-        self.tree.delete(*self.tree.get_children())
-        for row in results:
-            name, base, bonus, deductions, net = row
-            self.tree.insert("", "end", values=(
-                name,
-                f"${base:,.2f}",
-                f"${bonus:,.2f}",
-                f"${deductions:,.2f}",
-                f"${net:,.2f}",
-            ))
+        self.show_rows(list(results), SUMMARY_COLUMNS)
+
+    def update_range_table(self, report, by_department):
+        columns = [("Department" if by_department else "Employee Name", 180, "w")]
+        columns += [(period, 100, "e") for period in report["periods"]] + [("Total", 110, "e")]
+        self.show_rows(report["rows"], columns)
+
+    def show_rows(self, rows, columns):
+        # Rows are (label, amount, ...) and keyed by position since employee names need not be unique
+        self.report_rows = rows
+        source = ListSource(enumerate(rows), sort_keys=[lambda r: r[1][0].lower()] + [
+            lambda r, i=i: r[1][i] for i in range(1, len(columns))
+        ])
+        if columns != self.columns:
+            self.columns = columns
+            self.table.set_columns(columns, source)
+        else:
+            self.table.set_source(source)
+
+    def render_row(self, row):
+        _, (label, *amounts) = row
+        return (label, *(f"${amount:,.2f}" for amount in amounts))
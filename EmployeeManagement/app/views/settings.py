@@ -1,8 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as tb
-import hashlib
-from app.config import create_connection  # your DB connection helper
+from app.config import get_user_email, update_user_profile
 
 
 class SettingsView(tb.Frame):
@@ -20,17 +19,12 @@ class SettingsView(tb.Frame):
 
     def load_user_data(self):
         try:
-            conn = create_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT email FROM users WHERE username = %s", (self.username,))
-            row = cursor.fetchone()
-            if row:
-                self.user_data["email"] = row[0]
+            email = get_user_email(self.username)
+            if email is not None:
+                self.user_data["email"] = email
             else:
                 print(f"Error: User not found in database for username: {self.username}") # Changed
                 self.user_data["email"] = ""
-            cursor.close()
-            conn.close()
         except Exception as e:
             print(f"Database Error: Failed to load user data for {self.username}. Error: {e}") # Changed
             self.user_data["email"] = ""
@@ -124,30 +118,10 @@ class SettingsView(tb.Frame):
         # The 'if password:' check later will handle whether to update password
 
         try:
-            print(f"SettingsView.save_profile: Connecting to database...")
-            conn = create_connection()
-            cursor = conn.cursor()
-
-            # Update email
-            print(f"SettingsView.save_profile: Updating email to '{email}' for user '{self.username}'")
-            cursor.execute("UPDATE users SET email = %s WHERE username = %s", (email, self.username))
+            print(f"SettingsView.save_profile: Updating profile for user '{self.username}' (password change: {'yes' if password else 'no'})")
+            update_user_profile(self.username, email, password or None)
             self.user_data["email"] = email
-            print(f"SettingsView.save_profile: Email update executed.")
-
-            # Update password if provided and valid
-            if password: # This 'password' is already stripped and validated if it's not empty
-                print(f"SettingsView.save_profile: Preparing to update password for user '{self.username}'.")
-                hashed_password = hashlib.sha256(password.encode()).hexdigest()
-                cursor.execute("UPDATE users SET password = %s WHERE username = %s", (hashed_password, self.username))
-                print(f"SettingsView.save_profile: Password update SQL executed.")
-            else:
-                print(f"SettingsView.save_profile: No new password provided, skipping password update.")
-
-            print(f"SettingsView.save_profile: Committing changes to database...")
-            conn.commit()
             print(f"SettingsView.save_profile: Database commit successful.")
-            cursor.close()
-            conn.close()
 
             messagebox.showinfo("Success", "User profile updated successfully.")
             self.password_var.set("")
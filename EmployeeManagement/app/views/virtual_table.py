@@ -0,0 +1,394 @@
+from collections import OrderedDict
+
+import ttkbootstrap as tb
+
+from app.utils.background import run_in_background
+from app.views.loading import LoadingIndicator
+
+BLOCK_SIZE = 200  # rows fetched from a source per request
+MAX_BLOCKS = 50  # blocks kept in memory per table (least recently used are dropped)
+WHEEL_ROWS = 3
+
+
+class ListSource:
+    """
+    Rows already in memory (departments, report results). sort_keys has one entry per
+    table column: a callable(row) giving that column's sort key, or None if not sortable.
+    """
+    background = False
+
+    def __init__(self, rows=(), sort_keys=()):
+        self.rows = list(rows)
+        self.sort_keys = list(sort_keys)
+        self._sorted = {}  # (column, descending) -> sorted copy of rows
+
+    def sortable(self, column):
+        return column < len(self.sort_keys) and self.sort_keys[column] is not None
+
+    def count(self):
+        return len(self.rows)
+
+    def fetch(self, offset, limit, sort=None, descending=False, after=None, before=None):
+        # Slicing a list is already O(limit); after/before (seek hints) aren't needed
+        rows = self.rows
+        if sort is not None:
+            if (sort, descending) not in self._sorted:
+                self._sorted[(sort, descending)] = sorted(rows, key=self.sort_keys[sort], reverse=descending)
+            rows = self._sorted[(sort, descending)]
+        return rows[offset:offset + limit]
+
+
+class QuerySource:
+    """
+    Rows read from the database one block at a time, on the worker pool.
+    count()                                  -- e.g. count_attendance
+    fetch(offset, limit, sort, descending, after, before)
+        -- e.g. get_attendance_window; after / before are the rows adjacent to the
+           wanted block when the table holds one, so the query can seek from them
+    sort_keys -- per table column: the sort name fetch() accepts, or None
+    """
+    background = True
+
+    def __init__(self, count, fetch, sort_keys=()):
+        self._count = count
+        self._fetch = fetch
+        self.sort_keys = list(sort_keys)
+
+    def sortable(self, column):
+        return column < len(self.sort_keys) and self.sort_keys[column] is not None
+
+    def count(self):
+        return self._count()
+
+    def fetch(self, offset, limit, sort=None, descending=False, after=None, before=None):
+        sort = None if sort is None else self.sort_keys[sort]
+        return self._fetch(offset, limit, sort, descending, after=after, before=before)
+
+
+class VirtualTable(tb.Frame):
+    """
+    Treeview that only ever holds the rows on screen, so 100k-row tables cost the same
+    to show and scroll as 20-row ones. Rows come from a source (ListSource / QuerySource)
+    in blocks of BLOCK_SIZE; the scrollbar is driven by the source's row count.
+
+    columns    -- [(heading, width, anchor), ...]
+    render_row -- row -> tuple of display values (default: the row itself)
+    row_key    -- row -> unique id, used as the Treeview iid (default: row[0], the DB id)
+    stripes    -- background colours of the first and second row
+    """
+
+    def __init__(self, master, source, columns, render_row=None, row_key=None, height=15,
+                 style=None, stripes=("#d0ebff", "white")):
+        super().__init__(master)
+        self.source = source
+        self.render_row = render_row or tuple
+        self.row_key = row_key or (lambda row: row[0])
+
+        self.vsb = tb.Scrollbar(self, orient="vertical", command=self.yview)
+        self.vsb.pack(side="right", fill="y")
+        hsb = tb.Scrollbar(self, orient="horizontal")
+        hsb.pack(side="bottom", fill="x")
+
+        options = {"style": style} if style else {}
+        self.tree = tb.Treeview(
+            self,
+            show="headings",
+            selectmode="browse",
+            xscrollcommand=hsb.set,
+            height=height,
+            **options
+        )
+        self.tree.pack(fill="both", expand=True)
+        hsb.config(command=self.tree.xview)
+
+        self._setup_columns(columns)
+
+        self.tree.tag_configure('oddrow', background=stripes[0])
+        self.tree.tag_configure('evenrow', background=stripes[1])
+
+        self.loading = LoadingIndicator(self)
+
+        self.total = 0
+        self.offset = 0
+        self.visible = height
+        self.sort_column = None
+        self.descending = False
+        self._row_height = None  # measured from the first drawn row
+        self._heading_height = 0
+        self._blocks = OrderedDict()  # block index -> rows
+        self._edges = {}  # block index -> last row, the seek point for the block after it
+        self._pending = set()  # block indexes in flight
+        self._generation = 0  # bumped by reload() so results of an older load are dropped
+        self._window = {}  # iid -> row currently on screen
+        self._drawn = {}  # iid -> (values, tag) as last written to the Treeview
+        self._selected = {}  # iid -> row; outlives scrolling the row off screen
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_event(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_event(WHEEL_ROWS))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_event(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_event(self.visible))
+
+    # ------------------------------------------------------------------ #
+    #  P U B L I C
+    # ------------------------------------------------------------------ #
+    def reload(self, keep_position=True):
+        """Re-read the row count and the rows on screen (after data changed)."""
+        self._generation += 1
+        self._blocks.clear()
+        self._pending.clear()
+        # Rows added or removed above an edge shift it off its block boundary
+        self._edges.clear()
+        if not keep_position:
+            self.offset = 0
+        self._call(self.source.count, self._generation, self._on_count)
+
+    def set_source(self, source):
+        self.source = source
+        self._edges.clear()
+        self.sort_column = None
+        self.descending = False
+        self._selected.clear()
+        self._update_headings()
+        self.reload(keep_position=False)
+
+    def set_columns(self, columns, source):
+        """Switch to a different column layout (e.g. one column per period) and its rows."""
+        self.tree.delete(*self.tree.get_children())
+        self._window.clear()
+        self._drawn.clear()
+        self._setup_columns(columns)
+        self.set_source(source)
+
+    def sort_by(self, column):
+        if not self.source.sortable(column):
+            return
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, False
+        self._edges.clear()
+        self._update_headings()
+        self.reload(keep_position=False)
+
+    def remove_row(self, key):
+        """
+        Take out one row that was just deleted from the source, without re-reading the
+        whole window: only the blocks from that row on are fetched again.
+        """
+        iid = str(key)
+        self._selected.pop(iid, None)
+        for block, rows in sorted(self._blocks.items()):
+            if any(str(self.row_key(row)) == iid for row in rows):
+                for later in [b for b in self._blocks if b >= block]:
+                    del self._blocks[later]
+                for later in [b for b in self._edges if b >= block]:
+                    del self._edges[later]
+                self.total = max(0, self.total - 1)
+                self.offset = max(0, min(self.offset, self.total - self.visible))
+                self._generation += 1  # blocks already in flight may hold the old offsets
+                self._pending.clear()
+                self.render()
+                return
+        self.reload()
+
+    def selected_rows(self):
+        return list(self._selected.values())
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def yview(self, *args):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units" | "pages")
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible if args[2] == "pages" else 1)
+            self.scroll_to(self.offset + step)
+
+    def render(self):
+        stop = min(self.total, self.offset + self.visible)
+        rows = self._rows(self.offset, stop)
+        if rows is None:
+            return  # Redrawn when the missing block arrives
+
+        # Keyed diff against what is on screen: only rows that appeared, disappeared, moved
+        # or changed touch the Treeview, so a one-row edit or a one-row scroll is one Tk update
+        wanted = {}
+        for index, row in enumerate(rows, start=self.offset):
+            iid = str(self.row_key(row))
+            tag = 'oddrow' if index % 2 == 0 else 'evenrow'
+            wanted.setdefault(iid, (row, tuple(self.render_row(row)), tag))
+
+        stale = [iid for iid in self._drawn if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+        order = [iid for iid in self.tree.get_children() if iid in wanted]
+        for position, (iid, (row, values, tag)) in enumerate(wanted.items()):
+            drawn = self._drawn.get(iid)
+            if drawn is None:
+                self.tree.insert("", position, iid=iid, values=values, tags=(tag,))
+                order.insert(position, iid)
+            else:
+                if drawn != (values, tag):
+                    self.tree.item(iid, values=values, tags=(tag,))
+                if order[position] != iid:
+                    self.tree.move(iid, "", position)
+                    order.remove(iid)
+                    order.insert(position, iid)
+            if iid in self._selected:
+                self._selected[iid] = row
+                if iid not in self.tree.selection():
+                    self.tree.selection_set(iid)
+
+        self._drawn = {iid: (values, tag) for iid, (_, values, tag) in wanted.items()}
+        self._window = {iid: row for iid, (row, _, _) in wanted.items()}
+        self._update_scrollbar()
+        if rows and self._row_height is None:
+            self._measure()
+
+    # ------------------------------------------------------------------ #
+    #  D A T A
+    # ------------------------------------------------------------------ #
+    def _rows(self, start, stop):
+        """Rows [start, stop) from cached blocks, or None after requesting the missing ones."""
+        if stop <= start:
+            return []
+        first, last = start // BLOCK_SIZE, (stop - 1) // BLOCK_SIZE
+        missing = [b for b in range(first, last + 1) if b not in self._blocks]
+        for block in missing:
+            self._request(block)
+        if any(b not in self._blocks for b in missing):
+            return None
+        rows = []
+        for block in range(first, last + 1):
+            self._blocks.move_to_end(block)
+            rows.extend(self._blocks[block])
+        return rows[start - first * BLOCK_SIZE:stop - first * BLOCK_SIZE]
+
+    def _request(self, block):
+        if block in self._pending:
+            return
+        self._pending.add(block)
+        # Seek from a neighbouring block fetched since the last reload() when one is known;
+        # only a jump into the unknown costs an OFFSET scan
+        after = before = None
+        if block - 1 in self._edges:
+            after = self._edges[block - 1]
+        elif block + 1 in self._blocks and self._blocks[block + 1]:
+            before = self._blocks[block + 1][0]
+        self._call(
+            self.source.fetch, self._generation, lambda rows: self._on_block(block, rows),
+            block * BLOCK_SIZE, BLOCK_SIZE, self.sort_column, self.descending, after=after, before=before
+        )
+
+    def _call(self, func, generation, on_done, *args, **kwargs):
+        if not self.source.background:
+            on_done(func(*args, **kwargs))
+            return
+
+        def done(result):
+            self.loading.hide()
+            if generation == self._generation:
+                on_done(result)
+
+        def failed(error):
+            self.loading.hide()
+            if generation == self._generation:
+                print(f"[ERROR] Failed to load rows: {error}")
+
+        self.loading.show()
+        run_in_background(self, func, *args, on_done=done, on_error=failed, **kwargs)
+
+    def _on_count(self, total):
+        self.total = total
+        self.offset = max(0, min(self.offset, total - self.visible))
+        self.render()
+
+    def _on_block(self, block, rows):
+        self._pending.discard(block)
+        self._blocks[block] = rows
+        self._edges.pop(block, None)
+        if len(rows) == BLOCK_SIZE:
+            self._edges[block] = rows[-1]
+        while len(self._edges) > MAX_BLOCKS:
+            self._edges.pop(next(iter(self._edges)))
+        while len(self._blocks) > MAX_BLOCKS:
+            self._blocks.popitem(last=False)
+        if self.source.background:
+            self.render()
+
+    # ------------------------------------------------------------------ #
+    #  V I E W
+    # ------------------------------------------------------------------ #
+    def _setup_columns(self, columns):
+        self.headings = [heading for heading, _, _ in columns]
+        self.tree.configure(columns=self.headings)
+        for index, (heading, width, anchor) in enumerate(columns):
+            self.tree.heading(heading, text=heading, command=lambda c=index: self.sort_by(c))
+            self.tree.column(heading, width=width, anchor=anchor)
+
+    def _update_headings(self):
+        for index, heading in enumerate(self.headings):
+            arrow = ""
+            if index == self.sort_column:
+                arrow = " ▼" if self.descending else " ▲"
+            self.tree.heading(heading, text=heading + arrow)
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.vsb.set(0, 1)
+        else:
+            self.vsb.set(self.offset / self.total, min(1.0, (self.offset + self.visible) / self.total))
+
+    def _measure(self):
+        # Row height and heading height only exist once a row is drawn
+        first = self.tree.get_children()[0]
+        bbox = self.tree.bbox(first)
+        if bbox:
+            self._heading_height, self._row_height = bbox[1], bbox[3]
+            self._resize(self.tree.winfo_height())
+
+    def _on_configure(self, event):
+        if self._row_height:
+            self._resize(event.height)
+
+    def _resize(self, height):
+        visible = max(1, (height - self._heading_height) // self._row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, self.total - visible))
+            self.render()
+
+    def _on_select(self, event):
+        # Browse mode: an empty selection only means the selected row scrolled away
+        for iid in self.tree.selection():
+            if iid in self._window:
+                self._selected = {iid: self._window[iid]}
+
+    def _on_wheel(self, event):
+        return self._scroll_event(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _scroll_event(self, step):
+        self.scroll_to(self.offset + step)
+        return "break"
+
+    def _on_arrow(self, step):
+        # Inside the window Treeview moves the selection itself; at its edges the window scrolls
+        items = self.tree.get_children()
+        if not items or self.tree.focus() != items[0 if step < 0 else -1]:
+            return None
+        self.scroll_to(self.offset + step)
+        items = self.tree.get_children()
+        if items:
+            edge = items[0 if step < 0 else -1]
+            self.tree.focus(edge)
+            self.tree.selection_set(edge)
+        return "break"